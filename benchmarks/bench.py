@@ -0,0 +1,314 @@
+"""
+Headless veiktspējas testi render/update karstajiem ceļiem.
+
+    python -m benchmarks.bench                  # palaiž un salīdzina ar baseline
+    python -m benchmarks.bench --save-baseline  # saglabā pašreizējos rezultātus kā baseline
+    python -m benchmarks.bench --no-compare --output out.json --frames 600
+
+Baseline ir mašīnai specifisks, tāpēc netiek glabāts repozitorijā — vispirms
+--save-baseline uz tās pašas mašīnas. Izejas kods: 0 — nav regresiju,
+1 — median vai p95 pieaugums virs --tolerance, 2 — nav baseline faila.
+
+Ģenerē sintētiskas TMX kartes (maps/_bench/), mēra GameMap.load_map, GameMap.draw,
+get_solid_tiles (CollisionGrid), Player.update, MobSet.update/draw,
+TrapSet.check_many un NPC.draw_dialogue, un izvada median/p95/p99 laikus milisekundēs JSON formātā.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+BENCH_DIR = "_bench"
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+VIEW_SIZE = (500, 300)
+# Goblinu skaits mobu simulācijas mērījumam
+MOB_COUNT = 500
+
+# (platums, augstums tile vienībās, slazdu skaits, NPC skaits)
+SCENARIOS = [
+    (32, 32, 10, 1),
+    (128, 128, 200, 10),
+    (256, 256, 1000, 40),
+]
+
+# ==========================
+#     SINTĒTISKĀS KARTES
+# ==========================
+def generate_tmx(width, height, traps, npcs, seed=1):
+    """Izveido TMX ar rāmi, grīdām/platformām, slazdiem un NPC"""
+    rnd = random.Random(seed)
+    grid = [[0] * width for _ in range(height)]
+    for x in range(width):
+        grid[0][x] = grid[height - 1][x] = 67
+    for y in range(height):
+        grid[y][0] = grid[y][width - 1] = 67
+    for _ in range(width * height // 40):
+        x, y = rnd.randrange(1, width - 8), rnd.randrange(2, height - 2)
+        for i in range(rnd.randrange(2, 8)):
+            grid[y][x + i] = 67
+
+    def free_cell():
+        while True:
+            x, y = rnd.randrange(1, width - 1), rnd.randrange(1, height - 1)
+            if not grid[y][x]:
+                return x * 32, y * 32
+
+    objects = []
+    obj_id = 1
+    x, y = free_cell()
+    objects.append(f'  <object id="{obj_id}" type="PlayerSpawn" x="{x}" y="{y}" width="32" height="32"/>')
+    for _ in range(traps):
+        obj_id += 1
+        x, y = free_cell()
+        objects.append(
+            f'  <object id="{obj_id}" type="Trap" x="{x}" y="{y}" width="32" height="32">\n'
+            '   <properties>\n'
+            '    <property name="damage" value="1"/>\n'
+            '    <property name="damage-speed" value="1"/>\n'
+            '   </properties>\n'
+            '  </object>'
+        )
+    for _ in range(npcs):
+        obj_id += 1
+        x, y = free_cell()
+        objects.append(f'  <object id="{obj_id}" type="npc1" x="{x}" y="{y}" width="32" height="32"/>')
+
+    csv = ",\n".join(",".join(str(gid) for gid in row) for row in grid)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<map version="1.10" orientation="orthogonal" renderorder="right-down" width="{width}" '
+        f'height="{height}" tilewidth="32" tileheight="32" infinite="0" nextlayerid="3" nextobjectid="{obj_id + 1}">\n'
+        ' <tileset firstgid="1" name="tileset" tilewidth="32" tileheight="32" tilecount="169" columns="13">\n'
+        '  <image source="../tileset.jpg" width="416" height="416"/>\n'
+        ' </tileset>\n'
+        f' <layer id="1" name="Tile Layer 1" width="{width}" height="{height}">\n'
+        f'  <data encoding="csv">\n{csv}\n</data>\n'
+        ' </layer>\n'
+        ' <objectgroup id="2" name="Entity">\n'
+        + "\n".join(objects) + "\n"
+        ' </objectgroup>\n'
+        '</map>\n'
+    )
+
+# ==========================
+#         MĒRĪŠANA
+# ==========================
+def summarize(samples):
+    """ms paraugi -> median/p95/p99"""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "p95": pct(95),
+        "p99": pct(99),
+    }
+
+def timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+class BenchCamera:
+    def __init__(self):
+        self.offset = pygame.Vector2(0, 0)
+
+class HeldKeys:
+    """Imitē pygame.key.get_pressed() ar skriptētu ievadi"""
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __getitem__(self, key):
+        if key == pygame.K_d:
+            return (self.frame // 120) % 2 == 0
+        if key == pygame.K_a:
+            return (self.frame // 120) % 2 == 1
+        if key == pygame.K_w:
+            return self.frame % 45 < 2
+        return False
+
+def bench_scenario(width, height, traps, npcs, frames):
+    from codes.map import GameMap
+    from codes.player import Player
+    from codes.collision import CollisionGrid
+    from codes.mobs import MobSet
+    from codes.map_compiler import get_compiled_path
+
+    filename = f"{BENCH_DIR}/bench_{width}x{height}.tmx"
+    with open(os.path.join("maps", filename), "w", encoding="utf-8") as f:
+        f.write(generate_tmx(width, height, traps, npcs))
+
+    results = {}
+
+    # Pirmā ielāde ietver TMX kompilēšanu, pārējās lasa bināro failu
+    if os.path.exists(get_compiled_path(filename)):
+        os.remove(get_compiled_path(filename))
+    results["load_map_cold"] = summarize(timed(lambda: GameMap(filename), 1))
+    game_map = GameMap(filename)
+    results["load_map"] = summarize(timed(game_map.load_map, 5))
+
+    results["get_solid_tiles"] = summarize(timed(lambda: CollisionGrid(game_map), 5))
+    tiles = CollisionGrid(game_map)
+    # Collideru skaits pirms (cietās šūnas) un pēc apvienošanas
+    results["get_solid_tiles"].update(tiles.get_stats())
+
+    # Kamera brauc pa visu karti
+    surface = pygame.Surface(VIEW_SIZE)
+    camera = BenchCamera()
+    map_w, map_h = width * 32, height * 32
+    draw_samples = []
+    drawn = []
+    culled = []
+    for frame in range(frames):
+        camera.offset.x = (frame * 7) % max(map_w - VIEW_SIZE[0], 1)
+        camera.offset.y = (frame * 3) % max(map_h - VIEW_SIZE[1], 1)
+        surface.fill((0, 0, 0))
+        start = time.perf_counter()
+        game_map.draw(surface, camera)
+        draw_samples.append((time.perf_counter() - start) * 1000)
+        drawn.append(game_map.draw_stats["drawn"])
+        culled.append(game_map.draw_stats["culled"])
+    results["draw"] = summarize(draw_samples)
+    # Objekti kadrā (uzzīmēti / atmesti ar culling) pa visiem kadriem
+    results["draw"].update({
+        "drawn_median": statistics.median(drawn),
+        "drawn_max": max(drawn),
+        "culled_median": statistics.median(culled),
+        "culled_min": min(culled)
+    })
+
+    player = Player(*game_map.spawn_point)
+    update_samples = []
+    for frame in range(frames):
+        player.handle_input(HeldKeys(frame))
+        player.apply_gravity()
+        start = time.perf_counter()
+        player.update(tiles, game_map.traps)
+        update_samples.append((time.perf_counter() - start) * 1000)
+        if not player.alive:
+            player.hp = player.stats.hp
+            player.alive = True
+    results["player_update"] = summarize(update_samples)
+
+    # MOB_COUNT goblini uz brīvām šūnām, viens vektorizēts solis kadrā
+    rnd = random.Random(2)
+    mobs = MobSet()
+    while len(mobs) < MOB_COUNT:
+        x, y = rnd.randrange(width), rnd.randrange(height)
+        if not tiles.is_solid(x, y):
+            mobs.add(x * 32, y * 32, rnd.choice((-1, 1)))
+    results["mobs_update"] = summarize(timed(lambda: mobs.update(tiles), frames))
+    results["mobs_update"]["mobs"] = len(mobs)
+
+    # Visu goblinu slazdu pārbaude vienā check_many izsaukumā
+    n = len(mobs)
+    boxes = np.column_stack((mobs.x[:n], mobs.y[:n], np.full(n, mobs.width), np.full(n, mobs.height)))
+    clock = iter(range(0, frames * 1000, 16))
+    results["traps_check_many"] = summarize(timed(lambda: game_map.traps.check_many(boxes, next(clock)), frames))
+
+    camera.offset.update(game_map.spawn_point[0] - VIEW_SIZE[0] // 2, game_map.spawn_point[1] - VIEW_SIZE[1] // 2)
+    view_rect = game_map.get_view_rect(surface, camera)
+    results["mobs_draw"] = summarize(timed(lambda: mobs.draw(surface, camera, view_rect), frames))
+
+    if game_map.npcs:
+        npc = game_map.npcs[0]
+        npc.node = 0
+        npc.dialogue_index = 0
+        npc.interact()
+        results["npc_draw_dialogue"] = summarize(timed(lambda: npc.draw_dialogue(surface), frames))
+
+    return results
+
+# ==========================
+#     BASELINE SALĪDZINĀŠANA
+# ==========================
+def compare(results, baseline, tolerance):
+    """Atgriež regresiju sarakstu (median vai p95 pieaugums virs tolerances)"""
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, stats in metrics.items():
+            base = baseline.get(scenario, {}).get(metric)
+            if not base:
+                continue
+            for key in ("median", "p95"):
+                if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{scenario} {metric} {key}: {base[key]:.3f} -> {stats[key]:.3f} ms"
+                    )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless render/update benchmarks")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--output", help="JSON rezultātu fails")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--no-compare", action="store_true", help="tikai mērīt, nesalīdzināt ar baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="pieļaujamais pieaugums (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode(VIEW_SIZE)
+
+    bench_path = os.path.join("maps", BENCH_DIR)
+    if not os.path.exists(bench_path):
+        os.makedirs(bench_path)
+    npc_progress = os.path.join("game_info", "npc.json")
+    saved_progress = open(npc_progress, "rb").read() if os.path.exists(npc_progress) else None
+
+    results = {}
+    try:
+        for width, height, traps, npcs in SCENARIOS:
+            name = f"{width}x{height}_traps{traps}_npcs{npcs}"
+            print(f"[bench] {name} ...", file=sys.stderr)
+            results[name] = bench_scenario(width, height, traps, npcs, args.frames)
+    finally:
+        shutil.rmtree(bench_path, ignore_errors=True)
+        shutil.rmtree(os.path.join("maps", "compiled", BENCH_DIR), ignore_errors=True)
+        if saved_progress is not None:
+            with open(npc_progress, "wb") as f:
+                f.write(saved_progress)
+
+    text = json.dumps(results, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[bench] baseline saved to {args.baseline}", file=sys.stderr)
+    elif not args.no_compare:
+        if not os.path.exists(args.baseline):
+            print(f"[bench] no baseline at {args.baseline}: run with --save-baseline first "
+                  f"or pass --no-compare", file=sys.stderr)
+            sys.exit(2)
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[regression] {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"[bench] no regressions against {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
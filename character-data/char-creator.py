@@ -1,52 +1,23 @@
+import argparse
+import itertools
 import json
 import os
 import re
+import sys
+from multiprocessing import Pool
 
-CLASS_DIR = "class"
-ARMOR_FILE = "../equipment/armors/lv1armors.json"  # Tavs armor JSON fails
+# Klases, bruņas un spelli nāk no kopīgās satura datubāzes (codes/content.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from codes.content import get_content, thaw
 
 def list_classes():
-    return [d for d in os.listdir(CLASS_DIR) if os.path.isdir(os.path.join(CLASS_DIR, d))]
+    return get_content().get_classes()
 
 def load_class_data(class_name, level):
-    class_path = os.path.join(CLASS_DIR, class_name)
     character_data = {"class": class_name, "level": level}
-
-    # Ielādē spell count un detalizētos spellus
-    spell_file = os.path.join(class_path, "spells.json")
-    spells_data = {}
-    if os.path.exists(spell_file):
-        with open(spell_file, "r") as f:
-            spells_data = json.load(f)
-
-    for file_name in os.listdir(class_path):
-        if file_name.endswith(".json") and file_name != "spells.json":
-            key = file_name.replace(".json", "")
-            file_path = os.path.join(class_path, file_name)
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                level_key = f"level{level}"
-                value = data.get(level_key, None)
-
-                # Apstrādā Spells-lvX ierakstus damage-type
-                if key == "damage-type" and value:
-                    spells_info = {}
-                    new_value = []
-                    for dt in value:
-                        match = re.match(r"Spells-lv([\d\.]+)", dt)
-                        if match:
-                            lv_name = match.group(0)
-                            lv_number = match.group(1)
-                            available_spells = spells_data.get(f"level{lv_number}", [])
-                            count = len(available_spells)
-                            spells_info[lv_name] = count
-                        else:
-                            new_value.append(dt)
-                    character_data[key] = new_value
-                    if spells_info:
-                        character_data["spells"] = spells_info
-                else:
-                    character_data[key] = value
+    row = get_content().get_class_row(class_name, level)
+    if row:
+        character_data.update(thaw(row))
     return character_data
 
 def choose_from_list(options, prompt="Choose an option: "):
@@ -59,16 +30,13 @@ def choose_from_list(options, prompt="Choose an option: "):
         print("Invalid choice. Try again.")
 
 def choose_armor(character_class, allowed_types):
-    # Ielādē visus armor no JSON
-    if not os.path.exists(ARMOR_FILE):
-        print(f"Armor file {ARMOR_FILE} not found!")
+    all_armors = get_content().armors
+    if not all_armors:
+        print("No armors found!")
         return []
 
-    with open(ARMOR_FILE, "r") as f:
-        all_armors = json.load(f)
-
     # Filtrē armor pēc atļautā tipa
-    valid_armors = [a for a in all_armors if a["type"] in allowed_types]
+    valid_armors = [a for a in all_armors.values() if a["type"] in allowed_types]
     if not valid_armors:
         print(f"No valid armors for class {character_class}.")
         return []
@@ -85,17 +53,10 @@ def choose_armor(character_class, allowed_types):
             return [selected["id"]]
         print("Invalid choice. You must select one armor.")
 
-def choose_spells(character, class_path):
+def choose_spells(character, class_name):
     if "spells" not in character:
         return
 
-    spells_file = os.path.join(class_path, "spells.json")
-    if not os.path.exists(spells_file):
-        return
-
-    with open(spells_file, "r") as f:
-        spells_data = json.load(f)
-
     selected_spells = {}
 
     for lv_key, count in character["spells"].items():
@@ -103,7 +64,7 @@ def choose_spells(character, class_path):
         if not match:
             continue
         lv_number = match.group(1)
-        available_spells = spells_data.get(f"level{lv_number}", [])
+        available_spells = [thaw(spell) for spell in get_content().get_class_spells(class_name, lv_number)]
         if not available_spells or count <= 0:
             continue
 
@@ -138,15 +99,7 @@ def create_character():
 
     print("Available classes:")
     class_name = choose_from_list(classes, "Select a class by number: ")
-    class_path = os.path.join(CLASS_DIR, class_name)
-
-    levels = set()
-    for file_name in os.listdir(class_path):
-        if file_name.endswith(".json") and file_name != "spells.json":
-            with open(os.path.join(class_path, file_name), "r") as f:
-                data = json.load(f)
-                levels.update(int(k.replace("level","")) for k in data.keys() if k.replace("level","").isdigit())
-    levels = sorted(levels)
+    levels = get_content().get_levels(class_name)
 
     print("Available levels:", levels)
     while True:
@@ -167,7 +120,7 @@ def create_character():
         selected_armor_ids = choose_armor(class_name, allowed_armors)
         character["equipment"] = {"armor": selected_armor_ids}
 
-    choose_spells(character, class_path)
+    choose_spells(character, class_name)
 
     with open("character.json", "w") as f:
         json.dump(character, f, indent=4)
@@ -175,5 +128,119 @@ def create_character():
     print("\nCharacter saved to character.json!")
     print(json.dumps(character, indent=4))
 
+# ==========================
+#   MASVEIDA ĢENERĒŠANA
+# ==========================
+def character_variants(class_name, level, armor_filter=None):
+    """
+    Visi tēli vienai klasei un līmenim: katra atļautā bruņa × katra spellu
+    kombinācija (tik spellu no katra līmeņa, cik klase drīkst izvēlēties)
+    """
+    db = get_content()
+    base = load_class_data(class_name, level)
+
+    allowed_armors = base.get("armor") or []
+    armor_ids = [
+        a["id"] for a in db.armors.values()
+        if a["type"] in allowed_armors and (not armor_filter or a["id"] in armor_filter)
+    ]
+
+    spell_choices = []
+    for lv_key, count in (base.get("spells") or {}).items():
+        match = re.search(r"lv([\d\.]+)", lv_key)
+        if not match or count <= 0:
+            continue
+        available = [thaw(spell) for spell in db.get_class_spells(class_name, match.group(1))]
+        if available:
+            picks = min(count, len(available))
+            spell_choices.append([(lv_key, list(combo)) for combo in itertools.combinations(available, picks)])
+
+    # Klase bez atļautām bruņām — viena variante bez bruņas; ja filtrs
+    # atmeta visas atļautās bruņas, tēlu nav
+    index = 0
+    for armor_id in armor_ids if allowed_armors else [None]:
+        for spells in itertools.product(*spell_choices):
+            index += 1
+            character = dict(base)
+            character["name"] = f"{class_name}-lv{level}-{index}"
+            if allowed_armors:
+                character["equipment"] = {"armor": [armor_id]}
+            if spells:
+                character["spell"] = dict(spells)
+            yield character
+
+def _generate_lines(task):
+    """Process pool uzdevums: JSON Lines rindas vienai (klase, līmenis) kombinācijai"""
+    class_name, level, armor_filter = task
+    return [
+        json.dumps(character, ensure_ascii=False) + "\n"
+        for character in character_variants(class_name, level, armor_filter)
+    ]
+
+def run_batch(spec):
+    """
+    spec: {"classes": [...], "levels": [...], "armors": [...], "output": "fails.jsonl" | "-",
+    "workers": N}. Trūkstošie lauki = visas klases/līmeņi/bruņas, stdout, 1 process.
+    """
+    db = get_content()
+    classes = spec.get("classes") or db.get_classes()
+    armor_filter = spec.get("armors") or None
+    tasks = [
+        (class_name, level, armor_filter)
+        for class_name in classes
+        for level in db.get_levels(class_name)
+        if not spec.get("levels") or level in spec["levels"]
+    ]
+
+    output = spec.get("output", "-")
+    workers = spec.get("workers", 1)
+    out = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    total = 0
+    try:
+        if workers > 1:
+            with Pool(workers) as pool:
+                for lines in pool.imap(_generate_lines, tasks):
+                    out.writelines(lines)
+                    total += len(lines)
+        else:
+            for lines in map(_generate_lines, tasks):
+                out.writelines(lines)
+                total += len(lines)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Generated {total} characters for {len(tasks)} class/level combinations.", file=sys.stderr)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Character creator (interactive by default)")
+    parser.add_argument("--batch", action="store_true", help="generate all combinations without input()")
+    parser.add_argument("--spec", help="JSON spec file (classes, levels, armors, output, workers)")
+    parser.add_argument("--classes", help="comma separated class names")
+    parser.add_argument("--levels", help="comma separated levels")
+    parser.add_argument("--armors", help="comma separated armor ids")
+    parser.add_argument("--output", help="JSON Lines output file, '-' for stdout")
+    parser.add_argument("--workers", type=int, help="process pool size")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    create_character()
+    args = parse_args()
+    if args.batch or args.spec:
+        spec = {}
+        if args.spec:
+            with open(args.spec, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+        # Komandrindas argumenti ir svarīgāki par spec failu
+        if args.classes:
+            spec["classes"] = args.classes.split(",")
+        if args.levels:
+            spec["levels"] = [int(level) for level in args.levels.split(",")]
+        if args.armors:
+            spec["armors"] = args.armors.split(",")
+        if args.output:
+            spec["output"] = args.output
+        if args.workers:
+            spec["workers"] = args.workers
+        run_batch(spec)
+    else:
+        create_character()
+
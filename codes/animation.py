@@ -0,0 +1,91 @@
+import threading
+import pygame
+from codes.assets import asset_cache
+
+class AnimationClip:
+    def __init__(self, frames, fps=10, loop=False):
+        """
+        Sagriezti animācijas kadri un to apgrieztās versijas, sagatavotas vienreiz.
+        Klipu kopīgo visas animācijas, kas to izmanto — kadrā tiek izvēlēts tikai indekss.
+        """
+        self.frames = tuple(frames)
+        self.flipped = tuple(pygame.transform.flip(frame, True, False) for frame in self.frames)
+        self.fps = fps
+        self.loop = loop
+        self.frame_time = 1000 / fps  # ms
+
+    def __len__(self):
+        return len(self.frames)
+
+def slice_sheet(sheet, frame_w, frame_h):
+    """Sagriež sprite sheet kadros no kreisās uz labo, no augšas uz leju"""
+    sheet_w, sheet_h = sheet.get_size()
+    return [
+        sheet.subsurface((x, y, frame_w, frame_h))
+        for y in range(0, sheet_h - frame_h + 1, frame_h)
+        for x in range(0, sheet_w - frame_w + 1, frame_w)
+    ]
+
+# Klipi tiek sagriezti pēc pieprasījuma un kopīgoti starp visām animācijām
+_clips = {}
+_lock = threading.Lock()
+
+def load_clip(image_path, frame_w=None, frame_h=None, fps=10, loop=False, size=None):
+    """
+    Atgriež kopīgu klipu. Bez frame_w/frame_h viss attēls ir viens kadrs,
+    size — kadru izmērs pēc palielināšanas.
+    """
+    key = (image_path, frame_w, frame_h, fps, loop, tuple(size) if size else None)
+    with _lock:
+        clip = _clips.get(key)
+        if clip is None:
+            sheet = asset_cache.get_image(image_path)
+            frames = slice_sheet(
+                sheet,
+                frame_w or sheet.get_width(),
+                frame_h or sheet.get_height()
+            )
+            if size:
+                frames = [pygame.transform.scale(frame, (int(size[0]), int(size[1]))) for frame in frames]
+            clip = AnimationClip(frames, fps, loop)
+            _clips[key] = clip
+        return clip
+
+class Animation:
+    def __init__(self, clip):
+        """Viena atskaņošana (stāvoklis) kopīgam klipam — lēta, var būt daudz vienlaikus"""
+        self.clip = clip
+        self.current_frame = 0
+        self.timer = 0
+        self.playing = False
+        self.finished = False
+        self.flip_x = False
+
+    @property
+    def image(self):
+        frames = self.clip.flipped if self.flip_x else self.clip.frames
+        return frames[self.current_frame]
+
+    def play(self):
+        self.playing = True
+        self.finished = False
+        self.current_frame = 0
+        self.timer = 0
+
+    def stop(self):
+        self.playing = False
+
+    def update(self, dt):
+        if not self.playing or self.finished:
+            return
+        self.timer += dt * 1000  # dt = sekundes
+        while self.timer >= self.clip.frame_time:
+            self.timer -= self.clip.frame_time
+            self.current_frame += 1
+            if self.current_frame >= len(self.clip):
+                if self.clip.loop:
+                    self.current_frame = 0
+                else:
+                    self.current_frame = len(self.clip) - 1
+                    self.finished = True
+                    break
@@ -1,13 +1,12 @@
-import json
-import os
+from codes.content import get_content
 
 class ArmorManager:
-    def __init__(self, path, equipment_ids=None):
+    def __init__(self, equipment_ids=None, armors=None):
         """
-        path: ceļš uz armor JSON failu
         equipment_ids: saraksts ar ID, kurus Player aprīko sākumā (no character.json equipment["armor"])
+        armors: bruņas pēc ID (noklusējums — satura datubāze, sk. codes/content.py)
         """
-        self.armors = self.load_armors(path)
+        self.armors = armors if armors is not None else get_content().armors
         self.current_armor = None
 
         # Aprīko pirmo bruņu ID no equipment saraksta
@@ -17,23 +16,11 @@ class ArmorManager:
                     break
         elif self.armors:
             # default: pirmā bruņu sarakstā
-            self.current_armor = self.armors[0]
-
-    def load_armors(self, path):
-        """Ielādē bruņas no JSON faila"""
-        if not os.path.exists(path):
-            # print(f"[⚠️] Armor file not found: {path}")
-            return []
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            # print(f"[⚠️] Error loading armor file: {e}")
-            return []
+            self.current_armor = next(iter(self.armors.values()))
 
     def equip_armor(self, armor_id):
         """Aprīko konkrētas bruņas pēc ID"""
-        armor = next((a for a in self.armors if a["id"] == armor_id), None)
+        armor = self.armors.get(armor_id)
         if armor:
             self.current_armor = armor
             # print(f"[🛡️] Equipped armor: {armor['name']} ({int(armor['damage-reduce']*100)}%)")
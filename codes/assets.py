@@ -0,0 +1,87 @@
+import pygame
+import threading
+from collections import OrderedDict
+from codes.atlas import texture_atlas
+
+# Noklusējuma atmiņas budžets attēliem (baitos)
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+class AssetCache:
+    def __init__(self, budget=DEFAULT_BUDGET):
+        """
+        budget: maksimālais kešoto attēlu apjoms baitos, pēc tam tiek izmesti
+        vecākie (LRU) ieraksti
+        """
+        self.budget = budget
+        self.images = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Kartes var tikt ielādētas fona pavedienā (sk. MapCache)
+        self.lock = threading.RLock()
+
+    def get_image(self, path, size=None, flip_x=False, flip_y=False):
+        """Atgriež konvertētu attēlu pēc ceļa, izmēra un apgriešanas"""
+        with self.lock:
+            return self._get_image(path, size, flip_x, flip_y)
+
+    def _get_image(self, path, size, flip_x, flip_y):
+        key = (path, tuple(size) if size else None, flip_x, flip_y)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        if size or flip_x or flip_y:
+            # Variantu veido no kešotā oriģināla, nevis no diska
+            image = self._get_image(path, None, False, False)
+            if size:
+                image = pygame.transform.scale(image, (int(size[0]), int(size[1])))
+            if flip_x or flip_y:
+                image = pygame.transform.flip(image, flip_x, flip_y)
+        else:
+            # Mazās tekstūras nāk no atlasa (subsurface), pārējās — no diska
+            image = texture_atlas.get(path)
+            if image is None:
+                image = pygame.image.load(path).convert_alpha()
+
+        self._store(key, image)
+        return image
+
+    def _store(self, key, image):
+        self.images[key] = image
+        self.used += self._image_bytes(image)
+        while self.used > self.budget and len(self.images) > 1:
+            _, old = self.images.popitem(last=False)
+            self.used -= self._image_bytes(old)
+            self.evictions += 1
+
+    def _image_bytes(self, image):
+        # Atlasa subsurface dala atlasa lapas atmiņu
+        if image.get_parent() is not None:
+            return 0
+        return image.get_pitch() * image.get_height()
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.used = 0
+
+    def get_stats(self):
+        """Atgriež keša statistiku (trāpījumi, garām, izmestie, atmiņa)"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+            "evictions": self.evictions,
+            "entries": len(self.images),
+            "bytes": self.used,
+            "budget": self.budget
+        }
+
+# Kopīgais kešs visai spēlei
+asset_cache = AssetCache()
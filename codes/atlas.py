@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import pygame
+
+# Mapes, kuru PNG tiek sapakoti atlasā
+ATLAS_SOURCES = [
+    os.path.join("textures", "map"),
+    os.path.join("textures", "character"),
+    os.path.join("textures", "equipment"),
+    os.path.join("textures", "gui"),
+    os.path.join("textures", "mobs"),
+]
+ATLAS_DIR = os.path.join("textures", "atlas")
+MANIFEST_NAME = "atlas.json"
+# Maksimālais atlasa lapas izmērs pikseļos (lielāks attēls saņem savu lapu)
+ATLAS_PAGE_SIZE = 1024
+MANIFEST_VERSION = 1
+
+def normalize_path(path):
+    """Vienots atslēgas formāts neatkarīgi no os.path.join/slīpsvītrām"""
+    return os.path.normpath(path).replace("\\", "/")
+
+def list_sources(dirs=ATLAS_SOURCES):
+    """Visi PNG faili avota mapēs ar to mtime"""
+    sources = {}
+    for folder in dirs:
+        if not os.path.isdir(folder):
+            continue
+        for filename in sorted(os.listdir(folder)):
+            if filename.lower().endswith(".png"):
+                path = os.path.join(folder, filename)
+                sources[normalize_path(path)] = os.path.getmtime(path)
+    return sources
+
+def pack(sizes, page_size=ATLAS_PAGE_SIZE):
+    """
+    Plauktu (shelf) pakošana: augstākie attēli pirmie, rindās no kreisās uz labo.
+    sizes: {nosaukums: (w, h)} -> ({nosaukums: (lapa, x, y)}, [lapu izmēri])
+    """
+    page_size = max([page_size] + [max(size) for size in sizes.values()])
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+    placements = {}
+    pages = []
+    page = x = y = shelf_h = 0
+    used_w = used_h = 0
+    for name in order:
+        w, h = sizes[name]
+        if x + w > page_size:
+            y += shelf_h
+            x = shelf_h = 0
+        if y + h > page_size:
+            pages.append((used_w, used_h))
+            page += 1
+            x = y = shelf_h = used_w = used_h = 0
+        placements[name] = (page, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x)
+        used_h = max(used_h, y + h)
+    if placements:
+        pages.append((used_w, used_h))
+    return placements, pages
+
+def build_atlas(sources):
+    """Ielādē avotus un sapako lapās. Atgriež (lapu virsmas, {ceļš: (lapa, rect)})"""
+    images = {path: pygame.image.load(path) for path in sources}
+    placements, page_sizes = pack({path: image.get_size() for path, image in images.items()})
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    rects = {}
+    for path, (page, x, y) in placements.items():
+        image = images[path]
+        pages[page].blit(image, (x, y))
+        rects[path] = (page, (x, y) + image.get_size())
+    return pages, rects
+
+def write_atlas(pages, rects, sources, atlas_dir=ATLAS_DIR):
+    if not os.path.exists(atlas_dir):
+        os.makedirs(atlas_dir)
+    page_files = []
+    for i, page in enumerate(pages):
+        filename = f"atlas{i}.png"
+        pygame.image.save(page, os.path.join(atlas_dir, filename))
+        page_files.append(filename)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "pages": page_files,
+        "sprites": {
+            path: {"page": page, "rect": list(rect), "mtime": sources[path]}
+            for path, (page, rect) in rects.items()
+        }
+    }
+    with open(os.path.join(atlas_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+
+def read_manifest(sources, atlas_dir=ATLAS_DIR):
+    """Atgriež manifestu vai None, ja tā nav vai avota faili ir mainījušies"""
+    path = os.path.join(atlas_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    sprites = manifest.get("sprites", {})
+    if set(sprites) != set(sources):
+        return None
+    if any(sprites[path]["mtime"] != mtime for path, mtime in sources.items()):
+        return None
+    return manifest
+
+class TextureAtlas:
+    def __init__(self, dirs=ATLAS_SOURCES, atlas_dir=ATLAS_DIR):
+        """
+        Mazās tekstūras vienā vai dažās lapās. Ja ir svaigs iebūvētais atlass
+        (python -m codes.atlas), tiek atvērti tikai lapu faili, citādi atlass
+        tiek sapakots atmiņā pirmajā pieprasījumā. get() atgriež subsurface.
+        """
+        self.dirs = dirs
+        self.atlas_dir = atlas_dir
+        self.pages = []
+        self.sprites = {}
+        self.prebuilt = False
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            sources = list_sources(self.dirs)
+            manifest = read_manifest(sources, self.atlas_dir)
+            rects = None
+            if manifest:
+                try:
+                    self.pages = [
+                        pygame.image.load(os.path.join(self.atlas_dir, filename))
+                        for filename in manifest["pages"]
+                    ]
+                    rects = {
+                        path: (sprite["page"], tuple(sprite["rect"]))
+                        for path, sprite in manifest["sprites"].items()
+                    }
+                    self.prebuilt = True
+                except (pygame.error, OSError, KeyError):
+                    rects = None
+            if rects is None:
+                self.pages, rects = build_atlas(sources)
+
+            if pygame.display.get_surface():
+                self.pages = [page.convert_alpha() for page in self.pages]
+            self.sprites = {
+                path: self.pages[page].subsurface(rect)
+                for path, (page, rect) in rects.items()
+            }
+            self.loaded = True
+
+    def get(self, path):
+        """Tekstūras subsurface atlasā vai None, ja attēls nav atlasā"""
+        self.load()
+        return self.sprites.get(normalize_path(path))
+
+    def get_stats(self):
+        return {
+            "pages": len(self.pages),
+            "sprites": len(self.sprites),
+            "prebuilt": self.prebuilt,
+            "bytes": sum(page.get_pitch() * page.get_height() for page in self.pages)
+        }
+
+# Kopīgais atlass visai spēlei
+texture_atlas = TextureAtlas()
+
+if __name__ == "__main__":
+    # python -m codes.atlas — sapako tekstūras un saglabā textures/atlas/
+    sources = list_sources()
+    pages, rects = build_atlas(sources)
+    write_atlas(pages, rects, sources)
+    for i, page in enumerate(pages):
+        count = sum(1 for p, _ in rects.values() if p == i)
+        print(f"atlas{i}.png: {page.get_width()}x{page.get_height()}, {count} sprites")
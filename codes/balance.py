@@ -0,0 +1,270 @@
+"""
+Headless Monte Carlo līdzsvara simulators.
+
+    python -m codes.balance traps --map starter_area.tmx --samples 100000
+    python -m codes.balance traps --traps 12 --workers 4
+    python -m codes.balance duel --weapons sword-1,bow-1 --samples 5000 --output duel.json
+
+Tēli = klase × līmenis × atļautā bruņa (× ierocis dueļos) no satura datubāzes.
+Katra kombinācija tiek simulēta samples reizes ar NumPy masīviem (viena rinda =
+viena sadursme), kombinācijas var sadalīt pa procesiem (--workers). Izvada
+nāves laika (sekundes) sadalījumu: izdzīvošanu, vidējo, p5/p50/p95.
+
+Modelis:
+  - slazds (kā TrapSet.check/Player.update): sit uzreiz pie pieskāriena, tad ik
+    1000 / damage-speed ms, kamēr spēlētājs to šķērso ar samazinātu ātrumu;
+  - bojājumi tiek samazināti ar bruņu damage-reduce (kā Player.take_damage);
+  - cīņā sitiens ik 1 / hit-speed s, pirmais nejaušā brīdī intervālā, trāpa ar
+    HIT_CHANCE, bojājumi = klases damage × ieroča damage × nejaušs izkliedes reizinātājs.
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from codes.content import get_content
+from codes.player import FIXED_DT, MOVE_SPEED
+
+# Spēlētāja platums pikseļos (Player.rect) un ātrums uz slazda (Player.update)
+PLAYER_WIDTH = 24
+TRAP_SPEED = 1
+# Sintētiskās slazdu trases noklusējumi (kā GameMap Trap objektam)
+TRAP_WIDTH = 32
+TRAP_GAP = 64
+# Cik ilgi spēlētājs var vilcināties uz slazda (s), vienmērīgi 0..šis
+TRAP_HESITATION = 1.0
+
+HIT_CHANCE = 0.8
+DAMAGE_SPREAD = 0.25
+# Lielākais sitienu bloks vienā NumPy solī un maksimālais sitienu skaits (pēc tam — izdzīvo)
+HIT_BLOCK = 64
+MAX_HITS = 4096
+
+# ==========================
+#         TĒLI
+# ==========================
+def list_builds(classes=None, levels=None, armors=None, weapons=None):
+    """[(nosaukums, hp, damage, armor reduction, ieroča damage, hit-speed)]"""
+    db = get_content()
+    weapon_rows = [db.weapons[w] for w in weapons] if weapons else [None]
+    builds = []
+    for class_name in classes or db.get_classes():
+        for level in db.get_levels(class_name):
+            if levels and level not in levels:
+                continue
+            row = db.get_class_row(class_name, level)
+            allowed = row.get("armor") or ()
+            for armor in db.armors.values():
+                if armor["type"] not in allowed or (armors and armor["id"] not in armors):
+                    continue
+                for weapon in weapon_rows:
+                    name = f"{class_name}-lv{level}-{armor['id']}"
+                    if weapon:
+                        name += f"-{weapon['id']}"
+                    builds.append((
+                        name,
+                        float(row.get("hp") or 0),
+                        float(row.get("damage") or 0),
+                        float(armor["damage-reduce"]),
+                        float(weapon["damage"]) if weapon else 0.0,
+                        float(weapon["hit-speed"]) if weapon else 0.0
+                    ))
+    return builds
+
+# ==========================
+#       SLAZDU TRASE
+# ==========================
+def load_gauntlet(filename=None, traps=8):
+    """
+    Slazdi trases secībā: [(pieskāriena ilgums s, iešanas laiks līdz tam s, damage, intervāls s)].
+    Ar filename — kartes Trap objekti pēc x, citādi traps vienādi slazdi.
+    """
+    step_px = MOVE_SPEED / FIXED_DT       # px sekundē ejot
+    trap_px = TRAP_SPEED / FIXED_DT       # px sekundē uz slazda
+    if filename:
+        from codes.map_compiler import load_compiled_map
+        objects = [obj for obj in load_compiled_map(filename).objects if obj.type == "Trap"]
+        objects.sort(key=lambda obj: obj.x)
+        gauntlet = []
+        previous_end = objects[0].x if objects else 0
+        for obj in objects:
+            props = obj.properties or {}
+            gauntlet.append((
+                (obj.width + PLAYER_WIDTH) / trap_px,
+                max(obj.x - previous_end, 0) / step_px,
+                float(props.get("damage", 1)),
+                1 / float(props.get("damage-speed", 1))
+            ))
+            previous_end = obj.x + obj.width
+        return gauntlet
+    return [
+        ((TRAP_WIDTH + PLAYER_WIDTH) / trap_px, (TRAP_GAP / step_px) if i else 0.0, 1.0, 1.0)
+        for i in range(traps)
+    ]
+
+def simulate_traps(rng, samples, hp, reduction, gauntlet):
+    """Nāves laiks (s) katram paraugam, np.inf — izdzīvoja visu trasi"""
+    death = np.full(samples, np.inf)
+    taken = np.zeros(samples)
+    clock = np.zeros(samples)
+    for dwell, walk, damage, interval in gauntlet:
+        clock += walk
+        stay = dwell + rng.uniform(0, TRAP_HESITATION, samples)
+        hits = np.floor(stay / interval) + 1
+        per_hit = damage * (1 - reduction)
+        # Cik sitienu vajag līdz hp <= 0
+        needed = np.maximum(np.ceil((hp - taken) / per_hit), 1) if per_hit > 0 else np.full(samples, np.inf)
+        dies = np.isinf(death) & (needed <= hits)
+        death[dies] = clock[dies] + (needed[dies] - 1) * interval
+        taken += hits * per_hit
+        clock += stay
+    return death
+
+# ==========================
+#          CĪŅA
+# ==========================
+def time_to_kill(rng, samples, damage, hit_speed, hp, reduction):
+    """Laiks (s), kad uzbrucējs nogalina aizstāvi, np.inf — nespēj nogalināt"""
+    times = np.full(samples, np.inf)
+    if damage <= 0 or hit_speed <= 0 or reduction >= 1:
+        return times
+    interval = 1 / hit_speed
+    per_hit = damage * (1 - reduction)
+    # Bloks ~1.5x no vidēji vajadzīgo sitienu skaita, lai negenerētu liekus skaitļus
+    block = int(min(max(np.ceil(hp / (per_hit * HIT_CHANCE) * 1.5), 4), HIT_BLOCK))
+    offset = rng.uniform(0, interval, samples)
+    remaining = np.full(samples, hp)
+    alive = np.arange(samples)
+    hit = 0
+    while alive.size and hit < MAX_HITS:
+        shape = (alive.size, block)
+        dealt = (per_hit
+                 * rng.uniform(1 - DAMAGE_SPREAD, 1 + DAMAGE_SPREAD, shape)
+                 * (rng.random(shape) < HIT_CHANCE))
+        total = np.cumsum(dealt, axis=1)
+        dead = total >= remaining[alive][:, None]
+        killed = dead.any(axis=1)
+        first = dead.argmax(axis=1)
+        index = alive[killed]
+        times[index] = offset[index] + (hit + first[killed]) * interval
+        remaining[alive] -= total[:, -1]
+        alive = alive[~killed]
+        hit += block
+    return times
+
+def simulate_duel(rng, samples, a, b):
+    """(a nāves laiks, b nāves laiks) — cīņa beidzas ar pirmo nāvi, otrs izdzīvo"""
+    _, hp_a, damage_a, reduction_a, weapon_a, speed_a = a
+    _, hp_b, damage_b, reduction_b, weapon_b, speed_b = b
+    b_dies = time_to_kill(rng, samples, damage_a * weapon_a, speed_a, hp_b, reduction_b)
+    a_dies = time_to_kill(rng, samples, damage_b * weapon_b, speed_b, hp_a, reduction_a)
+    end = np.minimum(a_dies, b_dies)
+    return np.where(a_dies <= end, a_dies, np.inf), np.where(b_dies <= end, b_dies, np.inf)
+
+# ==========================
+#       STATISTIKA
+# ==========================
+def summarize(death):
+    dead = death[np.isfinite(death)]
+    result = {"samples": int(death.size), "survival": float(1 - dead.size / death.size)}
+    if dead.size:
+        p5, p50, p95 = np.percentile(dead, [5, 50, 95])
+        result.update({
+            "mean": float(dead.mean()),
+            "p5": float(p5),
+            "p50": float(p50),
+            "p95": float(p95)
+        })
+    return result
+
+def _run_task(task):
+    """Process pool uzdevums — RNG no (seed, uzdevuma nr), lai rezultāts nav atkarīgs no --workers"""
+    mode, index, seed, samples, payload = task
+    rng = np.random.default_rng([seed, index])
+    if mode == "traps":
+        build, gauntlet = payload
+        return {"build": build[0], **summarize(simulate_traps(rng, samples, build[1], build[3], gauntlet))}
+    a, b = payload
+    a_death, b_death = simulate_duel(rng, samples, a, b)
+    return {
+        "a": a[0],
+        "b": b[0],
+        "a_win": float(np.mean(np.isinf(a_death) & np.isfinite(b_death))),
+        "b_win": float(np.mean(np.isinf(b_death) & np.isfinite(a_death))),
+        "a_death": summarize(a_death),
+        "b_death": summarize(b_death)
+    }
+
+def run(tasks, workers):
+    if workers > 1:
+        with Pool(workers) as pool:
+            return list(pool.imap(_run_task, tasks, chunksize=max(len(tasks) // (workers * 8), 1)))
+    return [_run_task(task) for task in tasks]
+
+def print_table(mode, results):
+    def fmt(stats):
+        if "p50" not in stats:
+            return f"{stats['survival'] * 100:6.1f}%        -        -        -"
+        return (f"{stats['survival'] * 100:6.1f}% {stats['p5']:8.2f} "
+                f"{stats['p50']:8.2f} {stats['p95']:8.2f}")
+
+    if mode == "traps":
+        print(f"{'build':32} {'survive':>7} {'p5 s':>8} {'p50 s':>8} {'p95 s':>8}")
+        for result in results:
+            print(f"{result['build']:32} {fmt(result)}")
+    else:
+        print(f"{'a':36} {'b':36} {'a win':>6} {'b win':>6}  a death p50 / b death p50")
+        for result in results:
+            print(f"{result['a']:36} {result['b']:36} {result['a_win'] * 100:5.1f}% "
+                  f"{result['b_win'] * 100:5.1f}%  "
+                  f"{result['a_death'].get('p50', float('inf')):.2f} / {result['b_death'].get('p50', float('inf')):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator")
+    parser.add_argument("mode", choices=("traps", "duel"))
+    parser.add_argument("--samples", type=int, help="encounters per combination (default 100000 traps / 2000 duel)")
+    parser.add_argument("--classes", help="comma separated class names")
+    parser.add_argument("--levels", help="comma separated levels")
+    parser.add_argument("--armors", help="comma separated armor ids")
+    parser.add_argument("--weapons", default="sword-1", help="comma separated weapon ids (duel)")
+    parser.add_argument("--map", help="trap gauntlet from a map in maps/ (traps)")
+    parser.add_argument("--traps", type=int, default=8, help="synthetic gauntlet length (traps)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON results file")
+    args = parser.parse_args()
+
+    def split(value):
+        return value.split(",") if value else None
+
+    levels = [int(level) for level in split(args.levels)] if args.levels else None
+    if args.mode == "traps":
+        samples = args.samples or 100000
+        builds = list_builds(split(args.classes), levels, split(args.armors))
+        gauntlet = load_gauntlet(args.map, args.traps)
+        payloads = [(build, gauntlet) for build in builds]
+    else:
+        samples = args.samples or 2000
+        weapons = split(args.weapons)
+        unknown = [w for w in weapons or () if w not in get_content().weapons]
+        if unknown:
+            parser.error(f"unknown weapon id(s): {', '.join(unknown)}")
+        builds = list_builds(split(args.classes), levels, split(args.armors), weapons)
+        payloads = [(a, b) for i, a in enumerate(builds) for b in builds[i + 1:]]
+
+    tasks = [(args.mode, i, args.seed, samples, payload) for i, payload in enumerate(payloads)]
+    print(f"[balance] {args.mode}: {len(tasks)} combinations x {samples} = {len(tasks) * samples} encounters",
+          file=sys.stderr)
+    results = run(tasks, args.workers)
+    print_table(args.mode, results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
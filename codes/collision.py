@@ -0,0 +1,81 @@
+import pygame
+from array import array
+
+class CollisionGrid:
+    def __init__(self, map_data):
+        """Cietie tile šūnas no kartes režģa, lai sadursmes pārbaudītu tikai zem objekta"""
+        self.tilewidth = map_data.tilewidth
+        self.tileheight = map_data.tileheight
+        self.width = map_data.width
+        self.height = map_data.height
+        # Kompilētās kartes cietās šūnas (jau bez dublikātiem starp layeriem)
+        self.solid = map_data.compiled.solid
+
+        # Cik tile rect būtu bez apvienošanas (ieskaitot dublikātus starp layeriem)
+        self.tile_count = map_data.compiled.solid_count
+
+        # Apvienotie collideri un katras šūnas collidera indekss (-1 = tukšs)
+        self.colliders = []
+        self.cell_collider = array("i", [-1]) * (self.width * self.height)
+        self.merge_colliders()
+
+    def merge_colliders(self):
+        """Alkatīgi apvieno blakus esošās cietās šūnas maksimālos taisnstūros"""
+        width = self.width
+        for y in range(self.height):
+            for x in range(width):
+                if not self.solid[y * width + x] or self.cell_collider[y * width + x] != -1:
+                    continue
+
+                # Paplašina pa labi
+                w = 1
+                while (x + w < width and self.solid[y * width + x + w]
+                       and self.cell_collider[y * width + x + w] == -1):
+                    w += 1
+
+                # Paplašina uz leju, kamēr visa rinda ir brīva un cieta
+                h = 1
+                while y + h < self.height:
+                    row = (y + h) * width
+                    if all(self.solid[row + i] and self.cell_collider[row + i] == -1
+                           for i in range(x, x + w)):
+                        h += 1
+                    else:
+                        break
+
+                index = len(self.colliders)
+                self.colliders.append(pygame.Rect(
+                    x * self.tilewidth,
+                    y * self.tileheight,
+                    w * self.tilewidth,
+                    h * self.tileheight
+                ))
+                for cy in range(y, y + h):
+                    row = cy * width
+                    for cx in range(x, x + w):
+                        self.cell_collider[row + cx] = index
+
+    def get_stats(self):
+        """Atgriež collideru skaitu pirms un pēc apvienošanas"""
+        return {"tiles": self.tile_count, "colliders": len(self.colliders)}
+
+    def is_solid(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.solid[y * self.width + x] == 1
+        return False
+
+    def query(self, rect):
+        """Atgriež apvienotos colliderus, kas atrodas zem dotā rect"""
+        first_x = max(rect.left // self.tilewidth, 0)
+        first_y = max(rect.top // self.tileheight, 0)
+        last_x = min((rect.right - 1) // self.tilewidth, self.width - 1)
+        last_y = min((rect.bottom - 1) // self.tileheight, self.height - 1)
+
+        found = []
+        for y in range(first_y, last_y + 1):
+            row = y * self.width
+            for x in range(first_x, last_x + 1):
+                index = self.cell_collider[row + x]
+                if index != -1 and index not in found:
+                    found.append(index)
+        return [self.colliders[i] for i in found]
@@ -0,0 +1,247 @@
+import json
+import os
+import re
+import sys
+import threading
+from types import MappingProxyType
+
+# Ceļi relatīvi repozitorija saknei (char-creator.py darbojas no character-data/)
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CLASS_DIR = os.path.join(ROOT, "character-data", "class")
+ARMOR_DIR = os.path.join(ROOT, "equipment", "armors")
+WEAPON_DIR = os.path.join(ROOT, "equipment", "weapons")
+CACHE_PATH = os.path.join(ROOT, "game_info", "content-cache.json")
+CACHE_VERSION = 1
+
+SPELL_LEVEL = re.compile(r"Spells-lv([\d\.]+)")
+
+def _freeze(value):
+    """JSON vērtība -> nemaināma (dict -> MappingProxyType, list -> tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """Nemaināmā vērtība atpakaļ parastā dict/list (json.dump, rediģēšanai)"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+def _json_files(folder):
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith(".json")]
+
+def list_sources():
+    """Visi satura JSON faili ar mtime (relatīvi ROOT)"""
+    paths = _json_files(ARMOR_DIR) + _json_files(WEAPON_DIR)
+    if os.path.isdir(CLASS_DIR):
+        for class_name in sorted(os.listdir(CLASS_DIR)):
+            paths += _json_files(os.path.join(CLASS_DIR, class_name))
+    return {
+        os.path.relpath(path, ROOT).replace("\\", "/"): os.path.getmtime(path)
+        for path in paths
+    }
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ==========================
+#       KOMPILĒŠANA
+# ==========================
+def compile_content():
+    """
+    Nolasa visus satura failus un izveido tabulas: armor/weapon/spell pēc id,
+    klases rindas pēc līmeņa (tas pats, ko char-creator load_class_data) un
+    klases spellu id pēc spellu līmeņa.
+    """
+    problems = []
+
+    def index_items(paths, kind):
+        table = {}
+        for path in paths:
+            for item in _read(path):
+                if item["id"] in table and table[item["id"]] != item:
+                    problems.append(f"{kind} '{item['id']}' defined twice with different data")
+                    continue
+                table[item["id"]] = item
+        return table
+
+    armors = index_items(_json_files(ARMOR_DIR), "armor")
+    weapons = index_items(_json_files(WEAPON_DIR), "weapon")
+    spells = {}
+    classes = {}
+
+    class_names = sorted(
+        name for name in os.listdir(CLASS_DIR) if os.path.isdir(os.path.join(CLASS_DIR, name))
+    ) if os.path.isdir(CLASS_DIR) else []
+    for class_name in class_names:
+        class_path = os.path.join(CLASS_DIR, class_name)
+
+        # Spelli pa līmeņiem ("4" -> [id, ...]) un globālajā tabulā pēc id
+        class_spells = {}
+        spell_file = os.path.join(class_path, "spells.json")
+        if os.path.exists(spell_file):
+            for level_key, spell_list in _read(spell_file).items():
+                ids = []
+                for spell in spell_list:
+                    if spell["id"] in spells and spells[spell["id"]] != spell:
+                        problems.append(f"spell '{spell['id']}' defined twice with different data")
+                    else:
+                        spells[spell["id"]] = spell
+                    ids.append(spell["id"])
+                class_spells[level_key.replace("level", "", 1)] = ids
+
+        # Statistikas faili ("hp", "damage", ...) -> {"levelN": vērtība}
+        stat_files = {}
+        for path in _json_files(class_path):
+            if os.path.basename(path) != "spells.json":
+                stat_files[os.path.basename(path)[:-len(".json")]] = _read(path)
+        levels = sorted({
+            int(key.replace("level", "")) for data in stat_files.values()
+            for key in data if key.replace("level", "").isdigit()
+        })
+
+        rows = {}
+        for level in levels:
+            row = {}
+            for key, data in stat_files.items():
+                value = data.get(f"level{level}")
+                # "Spells-lvX" damage-type ierakstos kļūst par pieejamo spellu skaitu
+                if key == "damage-type" and value:
+                    spells_info = {}
+                    new_value = []
+                    for damage_type in value:
+                        match = SPELL_LEVEL.match(damage_type)
+                        if match:
+                            spells_info[match.group(0)] = len(class_spells.get(match.group(1), []))
+                        else:
+                            new_value.append(damage_type)
+                    row[key] = new_value
+                    if spells_info:
+                        row["spells"] = spells_info
+                else:
+                    row[key] = value
+            rows[str(level)] = row
+
+        classes[class_name] = {"levels": rows, "spells": class_spells}
+
+    return {
+        "version": CACHE_VERSION,
+        "armors": list(armors.values()),
+        "weapons": list(weapons.values()),
+        "spells": list(spells.values()),
+        "classes": classes,
+        "problems": problems
+    }
+
+def write_cache(data, sources, path=CACHE_PATH):
+    folder = os.path.dirname(path)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(data, sources=sources), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def read_cache(sources, path=CACHE_PATH):
+    """Atgriež kompilētos datus vai None, ja kešs nav vai avota faili ir mainījušies"""
+    if not os.path.exists(path):
+        return None
+    try:
+        data = _read(path)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CACHE_VERSION or data.get("sources") != sources:
+        return None
+    return data
+
+# ==========================
+#       DATUBĀZE
+# ==========================
+class ContentDB:
+    def __init__(self, data):
+        """
+        Nemaināmas satura tabulas ar O(1) meklēšanu:
+        armors/weapons/spells pēc id, klases rindas pēc (klase, līmenis).
+        """
+        self.armors = _freeze({item["id"]: item for item in data["armors"]})
+        self.weapons = _freeze({item["id"]: item for item in data["weapons"]})
+        self.spells = _freeze({item["id"]: item for item in data["spells"]})
+        self.problems = tuple(data.get("problems", ()))
+
+        rows = {}
+        class_spells = {}
+        levels = {}
+        for class_name, class_data in data["classes"].items():
+            levels[class_name] = tuple(sorted(int(level) for level in class_data["levels"]))
+            for level, row in class_data["levels"].items():
+                rows[(class_name, int(level))] = _freeze(row)
+            for spell_level, ids in class_data["spells"].items():
+                class_spells[(class_name, spell_level)] = tuple(self.spells[i] for i in ids)
+        self.class_rows = MappingProxyType(rows)
+        self.class_spells = MappingProxyType(class_spells)
+        self.class_levels = MappingProxyType(levels)
+
+    def get_classes(self):
+        return list(self.class_levels)
+
+    def get_levels(self, class_name):
+        return list(self.class_levels.get(class_name, ()))
+
+    def get_class_row(self, class_name, level):
+        """Klases statistika līmenī vai None"""
+        return self.class_rows.get((class_name, level))
+
+    def get_class_spells(self, class_name, spell_level):
+        """Klasei pieejamie spelli spellu līmenī ("4", "1.5", ...)"""
+        return self.class_spells.get((class_name, str(spell_level)), ())
+
+    def get_stats(self):
+        return {
+            "armors": len(self.armors),
+            "weapons": len(self.weapons),
+            "spells": len(self.spells),
+            "classes": len(self.class_levels),
+            "class_rows": len(self.class_rows),
+            "problems": len(self.problems)
+        }
+
+def load_content(path=CACHE_PATH):
+    """Nolasa kešu (viens fails); ja tā nav vai tas ir novecojis, pārkompilē"""
+    sources = list_sources()
+    data = read_cache(sources, path)
+    if data is None:
+        data = compile_content()
+        try:
+            write_cache(data, sources, path)
+        except OSError:
+            pass  # var darboties arī bez saglabāta keša
+    return ContentDB(data)
+
+# Satura datubāze tiek ielādēta pēc pieprasījuma un kopīgota
+_content = None
+_lock = threading.Lock()
+
+def get_content():
+    global _content
+    with _lock:
+        if _content is None:
+            _content = load_content()
+        return _content
+
+if __name__ == "__main__":
+    # python -m codes.content — pārkompilē kešu un parāda problēmas
+    sources = list_sources()
+    data = compile_content()
+    write_cache(data, sources)
+    db = ContentDB(data)
+    print(f"{os.path.relpath(CACHE_PATH)}: {db.get_stats()}")
+    for problem in db.problems:
+        print(f"  [⚠️] {problem}")
+    sys.exit(1 if db.problems else 0)
@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+import threading
+
+NPC_DIR = "npc"
+# Mērķis atbildei, kurai nav reakcijas — dialogs beidzas
+END = -1
+
+class DialogueNode:
+    def __init__(self, key, lines, responses, targets):
+        self.key = key              # reakcijas teksts (saknei None)
+        self.lines = lines          # NPC teikumi
+        self.responses = responses  # spēlētāja atbildes
+        self.targets = targets      # mezgla id katrai atbildei vai END
+
+class DialogueGraph:
+    def __init__(self, nodes, problems):
+        self.nodes = nodes
+        self.problems = problems
+
+    def find_node(self, lines):
+        """Atrod mezglu pēc teikumiem (vecā formāta progresa pārnešanai)"""
+        lines = tuple(lines)
+        for node_id, node in enumerate(self.nodes):
+            if node.lines == lines:
+                return node_id
+        return None
+
+def compile_dialogue(data):
+    """
+    Pārvērš NPC JSON (dialogue/responses/reactions) grafā ar veselu skaitļu
+    mezgliem. Mezgls 0 ir sākums, pārējie — reakcijas faila secībā.
+    """
+    reactions = data.get("reactions", {})
+    keys = list(reactions)
+    index = {key: i + 1 for i, key in enumerate(keys)}
+    problems = []
+
+    def build(key, node_data):
+        lines = node_data.get("dialogue")
+        if lines is None:
+            problems.append(f"reaction '{key}' has no dialogue")
+            lines = []
+        responses = node_data.get("responses", [])
+        targets = []
+        for response in responses:
+            if response in index:
+                targets.append(index[response])
+            else:
+                problems.append(f"response '{response}' has no reaction (ends dialogue)")
+                targets.append(END)
+        return DialogueNode(
+            sys.intern(key) if key else None,
+            tuple(sys.intern(line) for line in lines),
+            tuple(sys.intern(response) for response in responses),
+            tuple(targets)
+        )
+
+    nodes = [build(None, data)]
+    nodes += [build(key, reactions[key]) for key in keys]
+
+    # Nesasniedzamās reakcijas
+    reachable = {0}
+    stack = [0]
+    while stack:
+        for target in nodes[stack.pop()].targets:
+            if target != END and target not in reachable:
+                reachable.add(target)
+                stack.append(target)
+    for node_id, node in enumerate(nodes):
+        if node_id not in reachable:
+            problems.append(f"reaction '{node.key}' is unreachable")
+
+    return DialogueGraph(nodes, problems)
+
+# Grafi tiek kompilēti pēc pieprasījuma un kopīgoti starp visiem viena id NPC
+_graphs = {}
+_lock = threading.Lock()
+
+def get_dialogue_graph(npc_id):
+    with _lock:
+        graph = _graphs.get(npc_id)
+        if graph is None:
+            path = os.path.join(NPC_DIR, f"{npc_id}.json")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    graph = compile_dialogue(json.load(f))
+            else:
+                graph = compile_dialogue({"dialogue": ["..."]})
+            _graphs[npc_id] = graph
+        return graph
+
+if __name__ == "__main__":
+    # python -m codes.dialogue — pārbauda visus npc/*.json
+    failed = False
+    for filename in sorted(os.listdir(NPC_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(NPC_DIR, filename), "r", encoding="utf-8") as f:
+            graph = compile_dialogue(json.load(f))
+        print(f"{filename}: {len(graph.nodes)} nodes, {len(graph.problems)} problems")
+        for problem in graph.problems:
+            print(f"  [⚠️] {problem}")
+        failed = failed or bool(graph.problems)
+    sys.exit(1 if failed else 0)
@@ -1,6 +1,18 @@
 import pygame
-from pytmx.util_pygame import load_pygame
-import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from codes.assets import asset_cache
+from codes.trap import TrapSet
+from codes.mobs import MobSet
+from codes.map_compiler import load_compiled_map, build_tile_images
+
+# Statisko tile layeru gabala (chunk) izmērs tile vienībās
+CHUNK_SIZE = 16
+# Rezerve pikseļos ap kameru, lai objekti neparādītos pēkšņi pie malas
+CULL_MARGIN = 32
+# Cik ielādētas kartes tur atmiņā (aktīvā + durvju mērķi)
+MAP_CACHE_SIZE = 4
 
 class GameMap:
     def __init__(self, filename):
@@ -8,20 +20,34 @@ class GameMap:
         self.load_map()
 
     def load_map(self):
+        # Ielādē kompilēto karti (TMX tiek pārkompilēts, ja tas ir mainījies)
+        self.compiled = load_compiled_map(self.filename)
+        self.width = self.compiled.width
+        self.height = self.compiled.height
+        self.tilewidth = self.compiled.tilewidth
+        self.tileheight = self.compiled.tileheight
+        self.objects = self.compiled.objects
+        self.tile_images = build_tile_images(self.compiled)
+
+        # Statiskie tile layeri tiek uzzīmēti vienreiz gabalos (chunks)
+        self.chunks = {}
+        self.build_chunks()
+        self.load_objects()
+
+    def load_objects(self):
+        """Izveido kartes mainīgo stāvokli (durvis, slazdus, NPC, mobus) no objektiem"""
         from codes.npc import NPC  # Importē šeit, lai izvairītos no cikliskas importēšanas
-        # Ielādē TMX failu
-        self.tmx_data = load_pygame(os.path.join("maps", self.filename))
-        self.tilewidth = self.tmx_data.tilewidth
-        self.tileheight = self.tmx_data.tileheight
+        self.draw_stats = {"drawn": 0, "culled": 0}
 
         # Datu struktūras
         self.spawn_point = (100, 100)
         self.doors = []
-        self.traps = []
+        self.traps = TrapSet()
         self.npcs = []
+        self.mobs = MobSet()
 
         # Objektu lasīšana
-        for obj in self.tmx_data.objects:
+        for obj in self.objects:
             # Spawna punkts
             if obj.type == "PlayerSpawn":
                 self.spawn_point = (int(obj.x), int(obj.y))
@@ -44,50 +70,227 @@ class GameMap:
                 props = getattr(obj, "properties", {}) or {}
                 damage = float(props.get("damage", 1))
                 damage_speed = float(props.get("damage-speed", 1))
-                self.traps.append({
-                    "rect": rect,
-                    "damage": damage,
-                    "damage_speed": damage_speed,
-                    "last_hit": 0
-                })
+                self.traps.add(rect, damage, damage_speed)
+
+            # Ienaidnieki (goblini) — pēdas objekta apakšā
+            elif obj.type == "Enemy":
+                self.mobs.add(obj.x, obj.y + obj.height - self.mobs.height)
 
             # NPC
             elif obj.type and obj.type.startswith("npc"):
                 npc = NPC(obj)
                 self.npcs.append(npc)
 
-    def draw(self, screen, camera):
-        # Tiles layeri
-        for layer in self.tmx_data.visible_layers:
-            if hasattr(layer, "tiles"):
-                for x, y, image in layer.tiles():
-                    if image:
-                        screen.blit(
-                            image,
-                            (x * self.tilewidth - camera.offset.x,
-                             y * self.tileheight - camera.offset.y)
-                        )
-
-        # Object layeri — vizuālie elementi
-        for obj in self.tmx_data.objects:
+    def fresh_copy(self):
+        """
+        Jauna karte ar sākotnējiem objektiem (mobi spawn vietās, NPC ne dialogā,
+        slazdi bez atjaunošanās laikiem). Kompilētie dati, tile attēli un
+        gabali tiek kopīgoti, nevis ielādēti no jauna.
+        """
+        game_map = GameMap.__new__(GameMap)
+        game_map.filename = self.filename
+        game_map.compiled = self.compiled
+        game_map.width = self.width
+        game_map.height = self.height
+        game_map.tilewidth = self.tilewidth
+        game_map.tileheight = self.tileheight
+        game_map.objects = self.objects
+        game_map.tile_images = self.tile_images
+        game_map.chunks = self.chunks
+        game_map.load_objects()
+        return game_map
+
+    def build_chunks(self):
+        """Uzzīmē visus redzamos tile layerus CHUNK_SIZE x CHUNK_SIZE tile gabalos"""
+        chunk_w = CHUNK_SIZE * self.tilewidth
+        chunk_h = CHUNK_SIZE * self.tileheight
+
+        for gids in self.compiled.layers:
+            for i, gid in enumerate(gids):
+                if not gid:
+                    continue
+                x, y = i % self.width, i // self.width
+                key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+                chunk = self.chunks.get(key)
+                if chunk is None:
+                    chunk = pygame.Surface((chunk_w, chunk_h), pygame.SRCALPHA)
+                    self.chunks[key] = chunk
+                chunk.blit(
+                    self.tile_images[gid],
+                    ((x % CHUNK_SIZE) * self.tilewidth,
+                     (y % CHUNK_SIZE) * self.tileheight)
+                )
+
+    def get_view_rect(self, screen, camera):
+        """Atgriež kameras redzamo laukumu pasaules koordinātēs (ar rezervi)"""
+        view_w, view_h = screen.get_size()
+        return pygame.Rect(
+            int(camera.offset.x) - CULL_MARGIN,
+            int(camera.offset.y) - CULL_MARGIN,
+            view_w + CULL_MARGIN * 2,
+            view_h + CULL_MARGIN * 2
+        )
+
+    def draw(self, screen, camera, alpha=1.0):
+        view_rect = self.get_view_rect(screen, camera)
+        drawn = 0
+        culled = 0
+
+        # Tiles layeri — tikai tie gabali, kas pārklājas ar kameru
+        chunk_w = CHUNK_SIZE * self.tilewidth
+        chunk_h = CHUNK_SIZE * self.tileheight
+        first_cx = view_rect.left // chunk_w
+        first_cy = view_rect.top // chunk_h
+        last_cx = view_rect.right // chunk_w
+        last_cy = view_rect.bottom // chunk_h
+
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk:
+                    screen.blit(
+                        chunk,
+                        (cx * chunk_w - camera.offset.x,
+                         cy * chunk_h - camera.offset.y)
+                    )
+                    drawn += 1
+        culled += len(self.chunks) - drawn
+
+        # Object layeri — vizuālie elementi (atlasa tekstūras vienā blits izsaukumā)
+        sprites = []
+        for obj in self.objects:
+            if obj.type not in ("Trap", "Door", "PlayerSpawn"):
+                continue
+
             rect = pygame.Rect(
                 obj.x, obj.y,
                 getattr(obj, "width", 32),
                 getattr(obj, "height", 32)
             )
+            if not view_rect.colliderect(rect):
+                culled += 1
+                continue
+            drawn += 1
             rect.topleft = (rect.x - camera.offset.x, rect.y - camera.offset.y)
 
             if obj.type == "Trap":
-                trap_image = pygame.image.load("textures/map/trap1.png").convert_alpha()
-                trap_image = pygame.transform.scale(trap_image, (int(obj.width), int(obj.height)))
-                screen.blit(trap_image, (obj.x - camera.offset.x, obj.y - camera.offset.y))
+                trap_image = asset_cache.get_image("textures/map/trap1.png", (obj.width, obj.height))
+                sprites.append((trap_image, (obj.x - camera.offset.x, obj.y - camera.offset.y)))
             elif obj.type == "Door":
-                door_image = pygame.image.load("textures/map/door.png").convert_alpha()
-                door_image = pygame.transform.scale(door_image, (int(obj.width), int(obj.height)))
-                screen.blit(door_image, (obj.x - camera.offset.x, obj.y - camera.offset.y))
+                door_image = asset_cache.get_image("textures/map/door.png", (obj.width, obj.height))
+                sprites.append((door_image, (obj.x - camera.offset.x, obj.y - camera.offset.y)))
             elif obj.type == "PlayerSpawn":
                 pygame.draw.rect(screen, (0, 0, 255), rect, 2)
+        screen.blits(sprites, doreturn=False)
 
         # NPC zīmēšana
         for npc in self.npcs:
-            npc.draw(screen, camera)
\ No newline at end of file
+            if not view_rect.colliderect(npc.rect):
+                culled += 1
+                continue
+            npc.draw(screen, camera)
+            drawn += 1
+
+        # Mobi
+        mobs_drawn, mobs_culled = self.mobs.draw(screen, camera, view_rect, alpha)
+        drawn += mobs_drawn
+        culled += mobs_culled
+
+        # Statistika par pēdējo kadru
+        self.draw_stats = {"drawn": drawn, "culled": culled}
+
+class MapCache:
+    def __init__(self, max_maps=MAP_CACHE_SIZE):
+        """
+        Ielādētās kartes pēc faila nosaukuma. Durvju mērķi tiek ielādēti fonā,
+        lai, ejot cauri durvīm, karte jau būtu gatava. Pārpildot tiek izmesta
+        sen neizmantotā (LRU) karte. Kešā glabātās kartes netiek dotas spēlei —
+        get() katru reizi atgriež to fresh_copy().
+        """
+        self.max_maps = max_maps
+        self.maps = OrderedDict()
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filename):
+        """
+        Atgriež jaunu kartes kopiju no keša; ja karte vēl lādējas, sagaida to.
+        Ja fona ielāde neizdevās, izmet tās kļūdu (nākamā prefetch mēģinās vēlreiz).
+        """
+        with self.lock:
+            game_map = self.maps.get(filename)
+            if game_map is not None:
+                self.maps.move_to_end(filename)
+                self.hits += 1
+                return game_map.fresh_copy()
+            future = self.pending.pop(filename, None)
+
+        if future is not None:
+            game_map = future.result()
+            self.hits += 1
+        else:
+            self.misses += 1
+            game_map = GameMap(filename)
+
+        with self.lock:
+            self._store(filename, game_map)
+        return game_map.fresh_copy()
+
+    def prefetch(self, filename):
+        """Sāk ielādēt karti fona pavedienā, ja tā vēl nav kešā"""
+        with self.lock:
+            if filename in self.maps or filename in self.pending:
+                return
+            future = self.executor.submit(GameMap, filename)
+            self.pending[filename] = future
+        future.add_done_callback(lambda f: self._finish(filename, f))
+
+    def is_ready(self, filename):
+        """Vai get() atgriezīs karti uzreiz (bez gaidīšanas uz ielādi)"""
+        with self.lock:
+            if filename in self.maps:
+                return True
+            future = self.pending.get(filename)
+            return future is not None and future.done()
+
+    def is_loading(self, filename):
+        """Vai karte pašlaik lādējas fonā"""
+        with self.lock:
+            future = self.pending.get(filename)
+            return future is not None and not future.done()
+
+    def prefetch_doors(self, game_map):
+        """Sāk ielādēt visu aktīvās kartes durvju mērķus"""
+        for door in game_map.doors:
+            if door["target"]:
+                self.prefetch(door["target"])
+
+    def _finish(self, filename, future):
+        with self.lock:
+            if self.pending.get(filename) is not future:
+                return
+            # Neizdevusies ielāde paliek pending: is_ready() ir True un get() izmet kļūdu
+            if future.exception() is None:
+                del self.pending[filename]
+                self._store(filename, future.result())
+
+    def _store(self, filename, game_map):
+        self.maps[filename] = game_map
+        self.maps.move_to_end(filename)
+        while len(self.maps) > self.max_maps:
+            self.maps.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": list(self.maps),
+                "pending": list(self.pending)
+            }
+
+# Kopīgais karšu kešs
+map_cache = MapCache()
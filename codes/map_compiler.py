@@ -0,0 +1,309 @@
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+MAP_DIR = "maps"
+COMPILED_DIR = os.path.join("maps", "compiled")
+
+# Faila formāts: galvene, tilesets, tile layeri (gid masīvi), cietās šūnas, objektu tabula
+MAGIC = b"RPGM"
+VERSION = 1
+HEADER = struct.Struct("<4sHdIIII")
+TILESET = struct.Struct("<IIIIII")
+COUNT = struct.Struct("<I")
+STRING = struct.Struct("<H")
+
+# Tiled gid apgriešanas biti
+FLIP_X = 1 << 31
+FLIP_Y = 1 << 30
+FLIP_DIAGONAL = 1 << 29
+GID_MASK = FLIP_DIAGONAL - 1
+
+class MapObject:
+    """Kartes objekts ar tiem pašiem laukiem, ko izmanto no pytmx objekta"""
+    def __init__(self, type, name, x, y, width, height, properties):
+        self.type = type
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.properties = properties
+
+class CompiledMap:
+    def __init__(self, width, height, tilewidth, tileheight, tilesets, layers, solid, solid_count, objects):
+        self.width = width
+        self.height = height
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        self.tilesets = tilesets        # [{"firstgid", "tilewidth", ..., "source"}]
+        self.layers = layers            # [array("I")] — Tiled gid ar apgriešanas bitiem, 0 = tukšs
+        self.solid = solid              # bytearray width*height
+        self.solid_count = solid_count  # cieto tile skaits visos layeros (ar dublikātiem)
+        self.objects = objects          # [MapObject]
+
+# ==========================
+#       KOMPILĒŠANA
+# ==========================
+def compile_tmx(filename):
+    """Nolasa TMX failu ar pytmx (bez attēliem) un izveido CompiledMap"""
+    from pytmx import TiledMap, TiledTileLayer
+
+    tmx_data = TiledMap(os.path.join(MAP_DIR, filename))
+    width, height = tmx_data.width, tmx_data.height
+
+    # pytmx iekšējais gid -> oriģinālais Tiled gid ar apgriešanas bitiem
+    raw_gids = {0: 0}
+    for tiled_gid, entries in tmx_data.gidmap.items():
+        for gid, flags in entries:
+            raw = tiled_gid
+            if flags.flipped_horizontally:
+                raw |= FLIP_X
+            if flags.flipped_vertically:
+                raw |= FLIP_Y
+            if flags.flipped_diagonally:
+                raw |= FLIP_DIAGONAL
+            raw_gids[gid] = raw
+
+    tilesets = []
+    for tileset in tmx_data.tilesets:
+        if not tileset.source:
+            raise ValueError(f"{filename}: tileset '{tileset.name}' has no sheet image")
+        columns = tileset.columns or (
+            (tileset.width - 2 * tileset.margin + tileset.spacing) // (tileset.tilewidth + tileset.spacing)
+        )
+        tilesets.append({
+            "firstgid": tileset.firstgid,
+            "tilewidth": tileset.tilewidth,
+            "tileheight": tileset.tileheight,
+            "margin": tileset.margin,
+            "spacing": tileset.spacing,
+            "columns": columns,
+            "source": os.path.normpath(os.path.join(MAP_DIR, os.path.dirname(filename), tileset.source))
+        })
+
+    layers = []
+    solid = bytearray(width * height)
+    solid_count = 0
+    for layer in tmx_data.visible_layers:
+        if not isinstance(layer, TiledTileLayer):
+            continue
+        gids = array("I", bytes(4 * width * height))
+        for y, row in enumerate(layer.data):
+            for x, gid in enumerate(row):
+                if gid:
+                    gids[y * width + x] = raw_gids[gid]
+                    solid[y * width + x] = 1
+                    solid_count += 1
+        layers.append(gids)
+
+    objects = []
+    for obj in tmx_data.objects:
+        objects.append(MapObject(
+            obj.type, obj.name, obj.x, obj.y, obj.width, obj.height,
+            dict(getattr(obj, "properties", {}) or {})
+        ))
+
+    return CompiledMap(
+        width, height, tmx_data.tilewidth, tmx_data.tileheight,
+        tilesets, layers, solid, solid_count, objects
+    )
+
+def _pack_string(text):
+    data = text.encode("utf-8")
+    return STRING.pack(len(data)) + data
+
+def _unpack_string(data, pos):
+    (size,) = STRING.unpack_from(data, pos)
+    pos += STRING.size
+    return data[pos:pos + size].decode("utf-8"), pos + size
+
+def write_compiled(compiled, path, source_mtime):
+    """Saglabā CompiledMap bināro failu (atomāri caur pagaidu failu)"""
+    chunks = [HEADER.pack(
+        MAGIC, VERSION, source_mtime,
+        compiled.width, compiled.height, compiled.tilewidth, compiled.tileheight
+    )]
+
+    chunks.append(COUNT.pack(len(compiled.tilesets)))
+    for ts in compiled.tilesets:
+        chunks.append(TILESET.pack(
+            ts["firstgid"], ts["tilewidth"], ts["tileheight"],
+            ts["margin"], ts["spacing"], ts["columns"]
+        ))
+        chunks.append(_pack_string(ts["source"]))
+
+    chunks.append(COUNT.pack(len(compiled.layers)))
+    for gids in compiled.layers:
+        if sys.byteorder == "big":
+            gids = array("I", gids)
+            gids.byteswap()
+        chunks.append(gids.tobytes())
+
+    chunks.append(COUNT.pack(compiled.solid_count))
+    chunks.append(bytes(compiled.solid))
+
+    objects = [
+        [o.type, o.name, o.x, o.y, o.width, o.height, o.properties]
+        for o in compiled.objects
+    ]
+    objects_json = json.dumps(objects, ensure_ascii=False, default=str).encode("utf-8")
+    chunks.append(COUNT.pack(len(objects_json)))
+    chunks.append(objects_json)
+
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(chunks))
+    os.replace(tmp_path, path)
+
+def read_compiled(path):
+    """Nolasa bināro failu; atgriež (CompiledMap, avota mtime) vai None, ja formāts neder"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < HEADER.size:
+        return None
+    magic, version, source_mtime, width, height, tilewidth, tileheight = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    pos = HEADER.size
+    cells = width * height
+
+    tilesets = []
+    (count,) = COUNT.unpack_from(data, pos)
+    pos += COUNT.size
+    for _ in range(count):
+        firstgid, tw, th, margin, spacing, columns = TILESET.unpack_from(data, pos)
+        pos += TILESET.size
+        source, pos = _unpack_string(data, pos)
+        tilesets.append({
+            "firstgid": firstgid, "tilewidth": tw, "tileheight": th,
+            "margin": margin, "spacing": spacing, "columns": columns, "source": source
+        })
+
+    layers = []
+    (count,) = COUNT.unpack_from(data, pos)
+    pos += COUNT.size
+    for _ in range(count):
+        gids = array("I")
+        gids.frombytes(data[pos:pos + 4 * cells])
+        if sys.byteorder == "big":
+            gids.byteswap()
+        pos += 4 * cells
+        layers.append(gids)
+
+    (solid_count,) = COUNT.unpack_from(data, pos)
+    pos += COUNT.size
+    solid = bytearray(data[pos:pos + cells])
+    pos += cells
+
+    (size,) = COUNT.unpack_from(data, pos)
+    pos += COUNT.size
+    objects = [MapObject(*o) for o in json.loads(data[pos:pos + size].decode("utf-8"))]
+
+    compiled = CompiledMap(width, height, tilewidth, tileheight, tilesets, layers, solid, solid_count, objects)
+    return compiled, source_mtime
+
+def get_compiled_path(filename):
+    return os.path.join(COMPILED_DIR, os.path.splitext(filename)[0] + ".bin")
+
+def load_compiled_map(filename):
+    """Atgriež CompiledMap; ja binārā faila nav vai TMX ir mainījies, pārkompilē"""
+    tmx_path = os.path.join(MAP_DIR, filename)
+    bin_path = get_compiled_path(filename)
+    source_mtime = os.path.getmtime(tmx_path)
+
+    if os.path.exists(bin_path):
+        result = read_compiled(bin_path)
+        if result and result[1] == source_mtime:
+            return result[0]
+
+    compiled = compile_tmx(filename)
+    try:
+        write_compiled(compiled, bin_path, source_mtime)
+    except OSError:
+        pass  # var spēlēt arī bez saglabāta faila
+    return compiled
+
+# ==========================
+#       ATTĒLI
+# ==========================
+def build_tile_images(compiled):
+    """Izgriež tile attēlus no tileset lapām visiem kartē izmantotajiem gid"""
+    import pygame
+    from codes.assets import asset_cache
+
+    tilesets = sorted(compiled.tilesets, key=lambda ts: ts["firstgid"], reverse=True)
+    images = {}
+    for gids in compiled.layers:
+        for raw in set(gids):
+            if not raw or raw in images:
+                continue
+            gid = raw & GID_MASK
+            ts = next((t for t in tilesets if t["firstgid"] <= gid), None)
+            if ts is None:
+                continue
+
+            local = gid - ts["firstgid"]
+            sheet = asset_cache.get_image(ts["source"])
+            tile = sheet.subsurface((
+                ts["margin"] + (local % ts["columns"]) * (ts["tilewidth"] + ts["spacing"]),
+                ts["margin"] + (local // ts["columns"]) * (ts["tileheight"] + ts["spacing"]),
+                ts["tilewidth"],
+                ts["tileheight"]
+            ))
+            # Tāpat kā pytmx.util_pygame
+            if raw & FLIP_DIAGONAL:
+                tile = pygame.transform.flip(pygame.transform.rotate(tile, 270), True, False)
+            if raw & (FLIP_X | FLIP_Y):
+                tile = pygame.transform.flip(tile, bool(raw & FLIP_X), bool(raw & FLIP_Y))
+            images[raw] = tile
+    return images
+
+# ==========================
+#       KOMANDRINDA
+# ==========================
+def compile_all():
+    for filename in sorted(os.listdir(MAP_DIR)):
+        if filename.endswith(".tmx"):
+            compiled = compile_tmx(filename)
+            path = get_compiled_path(filename)
+            write_compiled(compiled, path, os.path.getmtime(os.path.join(MAP_DIR, filename)))
+            print(f"{filename} -> {path} ({os.path.getsize(path)} B)")
+
+def benchmark(repeats=20):
+    """Salīdzina TMX (pytmx.load_pygame) un kompilētās kartes ielādes laiku"""
+    import pygame
+    from pytmx.util_pygame import load_pygame
+
+    pygame.display.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode((1, 1))
+
+    for filename in sorted(os.listdir(MAP_DIR)):
+        if not filename.endswith(".tmx"):
+            continue
+        start = time.perf_counter()
+        for _ in range(repeats):
+            load_pygame(os.path.join(MAP_DIR, filename))
+        tmx_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        load_compiled_map(filename)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            build_tile_images(load_compiled_map(filename))
+        bin_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        print(f"{filename}: tmx {tmx_ms:.2f} ms, compiled {bin_ms:.2f} ms ({tmx_ms / bin_ms:.1f}x)")
+
+if __name__ == "__main__":
+    # python -m codes.map_compiler [--bench]
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        compile_all()
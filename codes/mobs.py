@@ -0,0 +1,160 @@
+import numpy as np
+from codes.animation import load_clip
+from codes.player import GRAVITY, MAX_FALL_SPEED
+
+GOBLIN_TEXTURE = "textures/mobs/goblin.png"
+# Goblina izmērs pikseļos (tāds pats kā tekstūrai)
+MOB_SIZE = (18, 27)
+# Patrulēšanas ātrums — goblini ir lēnāki par spēlētāju
+MOB_SPEED = 1
+# Sākotnējais vietu skaits kolonnās (pārpildot dubultojas)
+MOB_CAPACITY = 64
+
+# Kolonnas un to tipi
+COLUMNS = {
+    "x": np.float64,
+    "y": np.float64,
+    "prev_x": np.float64,    # pozīcija iepriekšējā solī (interpolācijai)
+    "prev_y": np.float64,
+    "vel_x": np.float64,     # zīme = patrulēšanas virziens
+    "vel_y": np.float64,
+    "on_ground": np.bool_,
+}
+
+class MobSet:
+    def __init__(self, texture=GOBLIN_TEXTURE, size=MOB_SIZE, speed=MOB_SPEED, capacity=MOB_CAPACITY):
+        """
+        Visi kartes mobi kolonnās (struct-of-arrays), nevis Player tipa objektos.
+        Gravitācija, kustība un sadursmes ar tile režģi tiek aprēķinātas visiem
+        mobiem vienā NumPy piegājienā katrā simulācijas solī.
+        """
+        self.texture = texture
+        self.width, self.height = size
+        self.speed = speed
+        self.count = 0
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, direction=-1):
+        if self.count == len(self.x):
+            self._resize(max(len(self.x) * 2, 1))
+        i = self.count
+        self.x[i] = self.prev_x[i] = round(x)
+        self.y[i] = self.prev_y[i] = round(y)
+        self.vel_x[i] = self.speed if direction > 0 else -self.speed
+        self.vel_y[i] = 0
+        self.on_ground[i] = False
+        self.count += 1
+
+    def _resize(self, capacity):
+        for name, dtype in COLUMNS.items():
+            column = np.zeros(capacity, dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def _keep(self, mask):
+        """Atstāj tikai mobus, kuriem mask ir True (kolonnas paliek blīvas)"""
+        n = self.count
+        kept = int(mask.sum())
+        for name in COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][mask]
+        self.count = kept
+
+    def reset_interpolation(self):
+        """Kad simulācija stāv (pāreja), zīmē pašreizējo pozīciju"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    @staticmethod
+    def _solid_at(solid, tiles, px, py):
+        """Vai pikseļu punkti ir cietās šūnās. Kartes sāni skaitās siena, augša/apakša — tukšums."""
+        cx = np.floor_divide(px, tiles.tilewidth).astype(np.intp)
+        cy = np.floor_divide(py, tiles.tileheight).astype(np.intp)
+        inside = (cx >= 0) & (cx < tiles.width) & (cy >= 0) & (cy < tiles.height)
+        index = np.where(inside, cy * tiles.width + cx, 0)
+        return np.where(inside, solid[index] != 0, (cx < 0) | (cx >= tiles.width))
+
+    @staticmethod
+    def _edge_offsets(length, step):
+        """Punkti gar malu ne retāk kā ik pa šūnai, lai netiktu izlaista neviena rinda/kolonna"""
+        return np.array(sorted(set(range(0, length, step)) | {length - 1}), dtype=np.float64)
+
+    def update(self, tiles):
+        """Viens FIXED_DT solis visiem mobiem — tāda pati fizika kā Player.update"""
+        n = self.count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        vel_x, vel_y = self.vel_x[:n], self.vel_y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        solid = np.frombuffer(tiles.solid, dtype=np.uint8)
+        tw, th = tiles.tilewidth, tiles.tileheight
+        w, h = self.width, self.height
+
+        # X kustība — priekšējā mala pret cietajām šūnām visās aizņemtajās rindās
+        x += vel_x
+        right = vel_x > 0
+        edge = np.where(right, x + w - 1, x)
+        rows = y[:, None] + self._edge_offsets(h, th)
+        rows[:, -1] = np.ceil(y + h) - 1
+        hit = self._solid_at(solid, tiles, edge[:, None], rows).any(axis=1)
+        col = np.floor_divide(edge, tw)
+        np.copyto(x, np.where(right, col * tw - w, (col + 1) * tw), where=hit)
+        # Atsitoties pret sienu, patrulē atpakaļ
+        vel_x[hit] *= -1
+
+        # Gravitācija un Y kustība
+        vel_y += GRAVITY
+        np.minimum(vel_y, MAX_FALL_SPEED, out=vel_y)
+        y += vel_y
+        falling = vel_y > 0
+        edge = np.where(falling, np.ceil(y + h) - 1, y)
+        cols = x[:, None] + self._edge_offsets(w, tw)
+        hit = self._solid_at(solid, tiles, cols, edge[:, None]).any(axis=1)
+        row = np.floor_divide(edge, th)
+        np.copyto(y, np.where(falling, row * th - h, (row + 1) * th), where=hit)
+        vel_y[hit] = 0
+        landed = hit & falling
+        self.on_ground[:n] = landed
+
+        # Platformas malā apgriežas, nevis nokrīt
+        front = np.where(vel_x > 0, x + w, x - 1)
+        turn = landed & ~self._solid_at(solid, tiles, front, y + h)
+        vel_x[turn] *= -1
+
+        # Izkritušie no kartes tiek izmesti
+        fallen = y > tiles.height * th
+        if fallen.any():
+            self._keep(~fallen)
+
+    def draw(self, screen, camera, view_rect, alpha=1.0):
+        """Zīmē redzamos mobus vienā blits izsaukumā. Atgriež (uzzīmēti, atmesti)."""
+        n = self.count
+        if not n:
+            return 0, 0
+        prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+        draw_x = prev_x + (self.x[:n] - prev_x) * alpha
+        draw_y = prev_y + (self.y[:n] - prev_y) * alpha
+
+        visible = np.flatnonzero(
+            (draw_x + self.width > view_rect.left) & (draw_x < view_rect.right)
+            & (draw_y + self.height > view_rect.top) & (draw_y < view_rect.bottom)
+        )
+        if len(visible):
+            clip = load_clip(self.texture, size=(self.width, self.height))
+            image, flipped = clip.frames[0], clip.flipped[0]
+            screen_x = np.round(draw_x[visible] - camera.offset.x).astype(int).tolist()
+            screen_y = np.round(draw_y[visible] - camera.offset.y).astype(int).tolist()
+            facing_right = (self.vel_x[:n][visible] > 0).tolist()
+            screen.blits(
+                [(flipped if r else image, (sx, sy)) for r, sx, sy in zip(facing_right, screen_x, screen_y)],
+                doreturn=False
+            )
+        return len(visible), n - len(visible)
@@ -1,71 +1,62 @@
 import pygame
-import json
-import os
+from codes.assets import asset_cache
+from codes.text_cache import text_cache
+from codes.progress_store import progress_store
+from codes.dialogue import get_dialogue_graph, END
 
 class NPC:
     def __init__(self, obj):
         self.id = obj.type  # piem. npc1
         self.name = getattr(obj, "name", self.id)
         self.rect = pygame.Rect(int(obj.x), int(obj.y), int(obj.width), int(obj.height))
-        self.image = pygame.image.load("textures/map/npc.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (int(obj.width), int(obj.height)))
+        self.image = asset_cache.get_image("textures/map/npc.png", (obj.width, obj.height))
         self.dialogue_index = 0
         self.in_dialogue = False
         self.active_responses = []
         self.selected_response = 0
+        # Uzzīmētais dialoga logs un stāvoklis, kuram tas atbilst
+        self.dialogue_panel = None
+        self.dialogue_panel_key = None
 
-        # --- Ielādē NPC datus ---
-        npc_data_path = os.path.join("npc", f"{self.id}.json")
-        if os.path.exists(npc_data_path):
-            with open(npc_data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.dialogue = data.get("dialogue", [])
-            self.responses = data.get("responses", [])
-            self.reactions = data.get("reactions", {})
-        else:
-            self.dialogue = ["..."]
-            self.responses = []
-            self.reactions = {}
+        # --- Dialoga grafs (kopīgs visiem šī id NPC) un pašreizējais mezgls ---
+        self.graph = get_dialogue_graph(self.id)
+        self.node = 0
 
-        # --- Saglabāšanas fails ---
-        self.progress_file = os.path.join("game_info", "npc.json")
+        # --- Saglabātais progress ---
         self._load_progress()
 
     # ==========================
     #       SAGLABĀŠANA
     # ==========================
     def _load_progress(self):
-        if not os.path.exists("game_info"):
-            os.makedirs("game_info")
-
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, "r", encoding="utf-8") as f:
-                all_progress = json.load(f)
-            npc_progress = all_progress.get(self.id, {})
+        npc_progress = progress_store.get(self.id)
+        if npc_progress is not None:
             self.dialogue_index = npc_progress.get("dialogue_index", 0)
-            self.dialogue = npc_progress.get("dialogue", self.dialogue)
-            self.responses = npc_progress.get("responses", self.responses)
+            if "node" in npc_progress:
+                node = npc_progress["node"]
+            else:
+                # Vecais formāts glabāja visu dialoga masīvu
+                node = self.graph.find_node(npc_progress.get("dialogue", []))
+            if node is None or not 0 <= node < len(self.graph.nodes):
+                node, self.dialogue_index = 0, 0
+            self.node = node
         else:
-            self._save_progress()  # izveido failu
+            self._save_progress()  # izveido ierakstu
 
     def _save_progress(self):
-        if not os.path.exists("game_info"):
-            os.makedirs("game_info")
+        # Tikai atzīmē izmaiņas; fails tiek rakstīts fonā
+        progress_store.set(self.id, {
+            "node": self.node,
+            "dialogue_index": self.dialogue_index
+        })
 
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, "r", encoding="utf-8") as f:
-                all_progress = json.load(f)
-        else:
-            all_progress = {}
+    @property
+    def dialogue(self):
+        return self.graph.nodes[self.node].lines
 
-        all_progress[self.id] = {
-            "dialogue_index": self.dialogue_index,
-            "dialogue": self.dialogue,
-            "responses": self.responses
-        }
-
-        with open(self.progress_file, "w", encoding="utf-8") as f:
-            json.dump(all_progress, f, ensure_ascii=False, indent=4)
+    @property
+    def responses(self):
+        return self.graph.nodes[self.node].responses
 
     # ==========================
     #       GALV. FUNKCIJAS
@@ -78,6 +69,7 @@ class NPC:
         self.in_dialogue = True
         self.active_responses = self.responses
         self.selected_response = 0
+        self.dialogue_panel = None
 
     def handle_input(self, event):
         if not self.in_dialogue:
@@ -112,13 +104,13 @@ class NPC:
             self._save_progress()
             return
 
-        choice = self.active_responses[self.selected_response]
-        if choice in self.reactions:
-            reaction = self.reactions[choice]
-            self.dialogue = reaction.get("dialogue", self.dialogue)
-            self.responses = reaction.get("responses", [])
+        target = self.graph.nodes[self.node].targets[self.selected_response]
+        if target != END:
+            self.node = target
             self.active_responses = self.responses
+            self.selected_response = 0
             self.dialogue_index = 0
+            self.dialogue_panel = None
             if not self.responses:
                 # Atļauj izlasīt līdz beigām
                 self.in_dialogue = True
@@ -128,29 +120,25 @@ class NPC:
         self._save_progress()
 
     def draw_dialogue(self, screen):
-        """Zīmē dialoga logu ar teksta aplaušanu un fonta samazinājumu"""
+        """Zīmē dialoga logu; panelis tiek pārzīmēts tikai, ja mainās dialoga stāvoklis"""
         if not self.in_dialogue:
             return
 
-        font = pygame.font.SysFont("Consolas", 20)  # samazināts font size
         box_rect = pygame.Rect(20, screen.get_height() - 160, screen.get_width() - 40, 140)
-        pygame.draw.rect(screen, (20, 20, 20), box_rect)
-        pygame.draw.rect(screen, (255, 255, 255), box_rect, 2)
-
-        def wrap_text(text, font, max_width):
-            words = text.split(' ')
-            lines = []
-            current_line = ''
-            for word in words:
-                test_line = current_line + (' ' if current_line else '') + word
-                if font.size(test_line)[0] <= max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            return lines
+        panel_size = (box_rect.width, screen.get_height() - box_rect.y)
+        key = (self.node, self.dialogue_index, self.selected_response, panel_size)
+        if self.dialogue_panel is None or self.dialogue_panel_key != key:
+            self.dialogue_panel = self.render_dialogue_panel(box_rect.width, box_rect.height, panel_size)
+            self.dialogue_panel_key = key
+        screen.blit(self.dialogue_panel, box_rect.topleft)
+
+    def render_dialogue_panel(self, box_width, box_height, panel_size):
+        """Uzzīmē dialoga logu ar teksta aplaušanu atsevišķā virsmā"""
+        font = text_cache.get_font("Consolas", 20)  # samazināts font size
+        panel = pygame.Surface(panel_size, pygame.SRCALPHA)
+        box_rect = pygame.Rect(0, 0, box_width, box_height)
+        pygame.draw.rect(panel, (20, 20, 20), box_rect)
+        pygame.draw.rect(panel, (255, 255, 255), box_rect, 2)
 
         # --- NPC teksts ---
         npc_lines = []
@@ -159,8 +147,8 @@ class NPC:
 
         y_offset = box_rect.y + 10
         for line in npc_lines:
-            text_surf = font.render(line, True, (255, 255, 255))
-            screen.blit(text_surf, (box_rect.x + 10, y_offset))
+            text_surf = text_cache.render(font, line, (255, 255, 255))
+            panel.blit(text_surf, (box_rect.x + 10, y_offset))
             y_offset += font.get_linesize()  # automātiska rindu augstuma atskaite
 
         # --- Spēlētāja atbildes ---
@@ -169,5 +157,21 @@ class NPC:
                 response_lines = wrap_text(response, font, box_rect.width - 40)
                 for j, line in enumerate(response_lines):
                     color = (255, 255, 0) if i == self.selected_response else (200, 200, 200)
-                    screen.blit(font.render(line, True, color), (box_rect.x + 20, y_offset))
+                    panel.blit(text_cache.render(font, line, color), (box_rect.x + 20, y_offset))
                     y_offset += font.get_linesize()
+        return panel
+
+def wrap_text(text, font, max_width):
+    words = text.split(' ')
+    lines = []
+    current_line = ''
+    for word in words:
+        test_line = current_line + (' ' if current_line else '') + word
+        if font.size(test_line)[0] <= max_width:
+            current_line = test_line
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
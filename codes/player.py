@@ -2,20 +2,37 @@ import pygame
 import os
 from codes.player_stats import PlayerStats
 from codes.armors import ArmorManager
+from codes.animation import Animation, load_clip
+from codes.text_cache import text_cache
+
+# Simulācijas solis sekundēs — visas ātruma/gravitācijas konstantes ir "uz soli"
+FIXED_DT = 1 / 60
+
+# Fizikas konstantes (kopīgas ar mobiem, sk. codes/mobs.py)
+MOVE_SPEED = 2
+JUMP_STRENGTH = 6
+DOUBLE_JUMP_MULTIPLIER = 0.75
+GRAVITY = 0.3
+MAX_FALL_SPEED = 10
+MAX_JUMPS = 2
 
 class Player:
     def __init__(self, x, y):
         self.rect = pygame.Rect(x, y, 24, 32)
+        # Pozīcija iepriekšējā simulācijas solī (interpolācijai zīmējot)
+        self.prev_pos = pygame.Vector2(self.rect.topleft)
+        # Simulācijas laiks ms (nevis pygame.time), lai soļi būtu deterministiski
+        self.sim_time = 0
         self.vel = pygame.Vector2(0, 0)
-        self.speed = 2
-        self.normal_speed = 2
-        self.jump_strength = 6
-        self.double_jump_multiplier = 0.75
-        self.gravity = 0.3
-        self.max_fall_speed = 10
+        self.speed = MOVE_SPEED
+        self.normal_speed = MOVE_SPEED
+        self.jump_strength = JUMP_STRENGTH
+        self.double_jump_multiplier = DOUBLE_JUMP_MULTIPLIER
+        self.gravity = GRAVITY
+        self.max_fall_speed = MAX_FALL_SPEED
         self.on_ground = False
         self.jump_count = 0
-        self.max_jumps = 2
+        self.max_jumps = MAX_JUMPS
         self.facing_right = False
 
         # Statistika
@@ -28,24 +45,21 @@ class Player:
         self.spells = self.stats.get_spell_list()
 
         # Armor manager
-        self.armor_manager = ArmorManager(
-            os.path.join("equipment", "armors", "lv1armors.json"),
-            self.stats.equipment.get("armor", [])
-        )
+        self.armor_manager = ArmorManager(self.stats.equipment.get("armor", []))
 
         # Ielādē attēlu pēc klases nosaukuma
         image_path = os.path.join("textures", "character", f"{self.char_class.lower()}.png")
         if os.path.exists(image_path):
-            self.original_image = pygame.image.load(image_path).convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (self.rect.width, self.rect.height))
-            self.image = self.original_image
+            # Viena kadra klips ar jau sagatavotu apgriezto versiju
+            self.animation = Animation(load_clip(image_path, size=self.rect.size))
+            self.image = self.animation.image
         else:
             self.image = None
             print(f"[⚠️] Image not found at {image_path}")
 
         # GUI
         self.show_stats = False
-        self.font = pygame.font.SysFont("consolas", 18)
+        self.font = text_cache.get_font("consolas", 18)
         self.alive = True
 
     # --- Input ---
@@ -80,7 +94,7 @@ class Player:
     def update(self, tiles, traps):
         # X kustība
         self.rect.x += self.vel.x
-        for tile in tiles:
+        for tile in tiles.query(self.rect):
             if self.rect.colliderect(tile):
                 if self.vel.x > 0:
                     self.rect.right = tile.left
@@ -90,7 +104,7 @@ class Player:
         # Y kustība
         self.rect.y += self.vel.y
         self.on_ground = False
-        for tile in tiles:
+        for tile in tiles.query(self.rect):
             if self.rect.colliderect(tile):
                 if self.vel.y > 0:
                     self.rect.bottom = tile.top
@@ -102,27 +116,17 @@ class Player:
                     self.vel.y = 0
 
         # Slazdi
-        current_time = pygame.time.get_ticks()
-        touching_trap = False
-        for trap in traps:
-            if self.rect.colliderect(trap["rect"]):
-                touching_trap = True
-                if "last_hit" not in trap:
-                    trap["last_hit"] = 0
-                interval = 1000 / trap["damage_speed"]
-                if current_time - trap["last_hit"] >= interval:
-                    self.take_damage(trap["damage"])
-                    trap["last_hit"] = current_time
+        self.sim_time += FIXED_DT * 1000
+        touching_trap, hits = traps.check(self.rect, self.sim_time)
+        for damage in hits:
+            self.take_damage(damage)
 
         self.speed = 1 if touching_trap else self.normal_speed
 
         # Attēla virziens
         if self.image:
-            self.image = (
-                pygame.transform.flip(self.original_image, True, False)
-                if not self.facing_right
-                else self.original_image
-            )
+            self.animation.flip_x = not self.facing_right
+            self.image = self.animation.image
 
     def take_damage(self, amount):
         reduction = self.armor_manager.get_damage_reduction()
@@ -137,8 +141,18 @@ class Player:
         self.show_stats = not self.show_stats
 
     # --- Drawing ---
-    def draw(self, screen, camera):
-        draw_pos = self.rect.move(-camera.offset.x, -camera.offset.y)
+    def get_render_pos(self, alpha=1.0):
+        """Interpolē starp iepriekšējo un pašreizējo simulācijas soli"""
+        return self.prev_pos.lerp(self.rect.topleft, alpha)
+
+    def draw(self, screen, camera, alpha=1.0):
+        pos = self.get_render_pos(alpha)
+        draw_pos = pygame.Rect(
+            round(pos.x - camera.offset.x),
+            round(pos.y - camera.offset.y),
+            self.rect.width,
+            self.rect.height
+        )
         if self.image:
             screen.blit(self.image, draw_pos)
         else:
@@ -176,7 +190,7 @@ class Player:
         pygame.draw.rect(screen, (200, 200, 200), (x, y, gui_width, gui_height), 2)
 
         for i, line in enumerate(lines):
-            text = self.font.render(line, True, (255, 255, 255))
+            text = text_cache.render(self.font, line, (255, 255, 255))
             screen.blit(text, (x + 10, y + 10 + i * line_height))
 
     def draw_hp_bar(self, screen):
@@ -189,7 +203,7 @@ class Player:
         pygame.draw.rect(screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
 
     def draw_death_message(self, screen):
-        font = pygame.font.SysFont("consolas", 48, bold=True)
-        text = font.render("YOU DIED", True, (255, 0, 0))
+        font = text_cache.get_font("consolas", 48, bold=True)
+        text = text_cache.render(font, "YOU DIED", (255, 0, 0))
         text_rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
         screen.blit(text, text_rect)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+import pygame
+from codes.text_cache import text_cache
+
+# Kadru budžets 60 FPS (ms)
+FRAME_BUDGET = 1000 / 60
+
+class FrameProfiler:
+    def __init__(self, capacity=300):
+        """
+        Mēra main cikla fāzes. Katrs kadrs ir saraksts ar (fāze, sākums, ilgums)
+        sekundēs; pēdējie `capacity` kadri glabājas riņķa buferī.
+        """
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.index = 0
+        self.count = 0
+        self.show_overlay = False
+        self.font = None
+        # Pēdējā kadra skaitītāji overlay (piem. uzzīmētie/atmestie objekti)
+        self.counters = {}
+
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.sections = []
+
+    # --- Mērīšana ---
+    def begin_frame(self):
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.sections = []
+
+    def lap(self, name):
+        """Pieraksta laiku kopš iepriekšējās atzīmes kā fāzi `name`"""
+        now = time.perf_counter()
+        self.sections.append((name, self.last_mark, now - self.last_mark))
+        self.last_mark = now
+
+    def end_frame(self):
+        total = time.perf_counter() - self.frame_start
+        self.frames[self.index] = (self.frame_start, total, self.sections)
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def set_counters(self, counters):
+        """Kadra skaitītāji, ko rāda overlay (vērtības pārraksta katru kadru)"""
+        self.counters.update(counters)
+
+    def get_frames(self):
+        """Saglabātie kadri no vecākā uz jaunāko"""
+        if self.count < self.capacity:
+            return self.frames[:self.count]
+        return self.frames[self.index:] + self.frames[:self.index]
+
+    def get_averages(self):
+        """Vidējais ms uz fāzi pa visiem buferī esošajiem kadriem"""
+        totals = {}
+        frames = self.get_frames()
+        for _, _, sections in frames:
+            for name, _, duration in sections:
+                totals[name] = totals.get(name, 0.0) + duration
+        return {name: value * 1000 / len(frames) for name, value in totals.items()}
+
+    # --- Overlay ---
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen):
+        if not self.show_overlay or not self.count:
+            return
+        if self.font is None:
+            self.font = text_cache.get_font("consolas", 16)
+
+        frames = self.get_frames()
+        graph_w, graph_h = 2 * self.capacity, 120
+        x, y = screen.get_width() - graph_w - 20, 20
+        scale = graph_h / (FRAME_BUDGET * 2)
+
+        panel = pygame.Surface((graph_w, graph_h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        screen.blit(panel, (x, y))
+
+        for i, (_, total, _) in enumerate(frames):
+            ms = total * 1000
+            bar_h = min(ms * scale, graph_h)
+            color = (0, 200, 0) if ms <= FRAME_BUDGET else (220, 50, 50)
+            pygame.draw.line(screen, color, (x + i * 2, y + graph_h), (x + i * 2, y + graph_h - bar_h), 2)
+        budget_y = y + graph_h - FRAME_BUDGET * scale
+        pygame.draw.line(screen, (255, 255, 0), (x, budget_y), (x + graph_w, budget_y))
+
+        averages = self.get_averages()
+        lines = [f"frame {frames[-1][1] * 1000:5.2f} ms"]
+        lines += [f"{name:<12}{ms:6.2f} ms" for name, ms in averages.items()]
+        lines += [f"{name:<12}{value:6d}" for name, value in self.counters.items()]
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, (255, 255, 255))
+            screen.blit(text, (x, y + graph_h + 5 + i * (self.font.get_height() + 2)))
+
+    # --- Eksports ---
+    def export(self, path):
+        """Saglabā buferi: .csv — tabula, citādi Chrome trace JSON (chrome://tracing)"""
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+    def export_chrome_trace(self, path):
+        events = []
+        for i, (start, total, sections) in enumerate(self.get_frames()):
+            events.append({
+                "name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                "ts": start * 1e6, "dur": total * 1e6, "args": {"frame": i}
+            })
+            for name, section_start, duration in sections:
+                events.append({
+                    "name": name, "ph": "X", "pid": 0, "tid": 0,
+                    "ts": section_start * 1e6, "dur": duration * 1e6
+                })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        frames = self.get_frames()
+        names = []
+        for _, _, sections in frames:
+            for name, _, _ in sections:
+                if name not in names:
+                    names.append(name)
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + names)
+            for i, (_, total, sections) in enumerate(frames):
+                row = dict.fromkeys(names, 0.0)
+                for name, _, duration in sections:
+                    row[name] += duration * 1000
+                writer.writerow([i, f"{total * 1000:.4f}"] + [f"{row[n]:.4f}" for n in names])
@@ -0,0 +1,94 @@
+import atexit
+import json
+import os
+import threading
+
+PROGRESS_FILE = os.path.join("game_info", "npc.json")
+# Cik sekundes pēc pēdējās izmaiņas gaidīt pirms rakstīšanas diskā
+FLUSH_DELAY = 0.5
+
+class ProgressStore:
+    def __init__(self, path=PROGRESS_FILE, delay=FLUSH_DELAY):
+        """
+        Kopīgs NPC progresa glabātājs. Fails tiek nolasīts vienreiz, izmaiņas
+        tiek atzīmētas kā "netīras" un fona pavedienā ierakstītas ar aizturi
+        (debounce) caur pagaidu failu + os.replace, lai avārija nesabojātu failu.
+        """
+        self.path = path
+        self.delay = delay
+        self.entries = None
+        # Katra ieraksta jau sagatavotais JSON teksts — pārrakstot kodē tikai izmainītos
+        self.encoded = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.timer = None
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, key):
+        """Atgriež saglabāto progresu vai None"""
+        with self.lock:
+            self._load()
+            return self.entries.get(key)
+
+    def set(self, key, value):
+        """Atjauno ierakstu atmiņā un ieplāno rakstīšanu (neaiztur kadru)"""
+        with self.lock:
+            self._load()
+            self.entries[key] = value
+            self.dirty.add(key)
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        """Ieraksta failu, ja ir izmaiņas (izsauc arī pie iziešanas)"""
+        with self.write_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                dirty, self.dirty = self.dirty, set()
+                entries = dict(self.entries)
+
+            # Tāds pats formāts kā json.dump(..., indent=4)
+            for key in entries:
+                if key not in dirty and key in self.encoded:
+                    continue
+                text = json.dumps(entries[key], ensure_ascii=False, indent=4)
+                self.encoded[key] = text.replace("\n", "\n    ")
+            parts = [
+                f"    {json.dumps(key, ensure_ascii=False)}: {self.encoded[key]}"
+                for key in entries
+            ]
+            content = "{\n" + ",\n".join(parts) + "\n}" if parts else "{}"
+
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError:
+                # Mēģinās vēlreiz pie nākamās izmaiņas
+                with self.lock:
+                    self.dirty |= dirty
+
+# Kopīgais progresa glabātājs visiem NPC
+progress_store = ProgressStore()
+atexit.register(progress_store.flush)
@@ -0,0 +1,30 @@
+import pygame
+
+class RenderTargets:
+    def __init__(self, world_size):
+        """
+        Kadriem kopīgās virsmas: zemas izšķirtspējas pasaules kadrs un pauzes
+        aptumšojums. Tiek izveidotas vienreiz un pārbūvētas tikai, ja mainās
+        ekrāna izmērs (piem. F11).
+        """
+        self.world_size = world_size
+        self.world = None
+        self.pause_overlay = None
+        self.screen_size = None
+
+    def resize(self, screen):
+        """Izsauc pēc katra display.set_mode — pārbūvē tikai to, kas mainījies"""
+        if self.world is None:
+            self.world = pygame.Surface(self.world_size).convert()
+
+        size = screen.get_size()
+        if size == self.screen_size:
+            return
+        self.screen_size = size
+        self.pause_overlay = pygame.Surface(size).convert()
+        self.pause_overlay.set_alpha(180)
+        self.pause_overlay.fill((0, 0, 0))
+
+    def present(self, screen):
+        """Palielina pasaules kadru tieši display virsmā (bez starpvirsmas)"""
+        pygame.transform.scale(self.world, self.screen_size, screen)
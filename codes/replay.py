@@ -0,0 +1,92 @@
+import struct
+import zlib
+import pygame
+
+# Faila formāts: galvene, starta kartes nosaukums, 3 baiti katram "playing" kadram
+MAGIC = b"RPGR"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIH")   # magic, versija, kadri, kontrolsumma, kartes nosaukuma garums
+FRAME = struct.Struct("<HB")        # kadra ilgums ms, taustiņu biti
+# Garāks kadrs tiek saīsināts (arī spēlē ierakstīšanas laikā, lai atkārtojums sakristu)
+MAX_FRAME_MS = 0xFFFF
+
+# Ierakstītie taustiņi — bita nr. = indekss sarakstā
+RECORDED_KEYS = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_o, pygame.K_t)
+# Šajā kadrā tika ielādēta nākamā karte (durvju pārejas "out" fāze)
+MAP_LOADED = 1 << 7
+
+def player_checksum(player, game_map):
+    """CRC32 no spēlētāja simulācijas stāvokļa un aktīvās kartes"""
+    state = struct.pack(
+        "<iiiiddd?id",
+        player.rect.x, player.rect.y, player.rect.width, player.rect.height,
+        player.vel.x, player.vel.y, player.hp,
+        player.on_ground, player.jump_count, player.sim_time
+    )
+    return zlib.crc32(game_map.filename.encode("utf-8") + state)
+
+class InputRecorder:
+    def __init__(self, start_map):
+        """Ieraksta katra "playing" kadra dt un taustiņus atmiņā, saglabā beigās"""
+        self.start_map = start_map
+        self.frames = bytearray()
+        self.count = 0
+
+    def record(self, frame_ms, keys, map_loaded=False):
+        bits = 0
+        for bit, key in enumerate(RECORDED_KEYS):
+            if keys[key]:
+                bits |= 1 << bit
+        if map_loaded:
+            bits |= MAP_LOADED
+        self.frames += FRAME.pack(frame_ms, bits)
+        self.count += 1
+
+    def save(self, path, checksum):
+        name = self.start_map.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.count, checksum, len(name)))
+            f.write(name)
+            f.write(self.frames)
+
+class ReplayKeys:
+    """Aizvieto pygame.key.get_pressed() ar ierakstītajiem bitiem"""
+    def __init__(self, bits):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        if key in RECORDED_KEYS:
+            return bool(self.bits & (1 << RECORDED_KEYS.index(key)))
+        return False
+
+class InputLog:
+    def __init__(self, start_map, frames, checksum):
+        self.start_map = start_map
+        self.frames = frames          # [(frame_ms, bits)]
+        self.checksum = checksum
+        self.position = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, count, checksum, name_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not an input log (version {VERSION})")
+        pos = HEADER.size
+        start_map = data[pos:pos + name_len].decode("utf-8")
+        pos += name_len
+        frames = list(FRAME.iter_unpack(data[pos:pos + count * FRAME.size]))
+        if len(frames) != count:
+            raise ValueError(f"{path}: truncated ({len(frames)} of {count} frames)")
+        return cls(start_map, frames, checksum)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.frames)
+
+    def next_frame(self):
+        """(kadra ms, ReplayKeys, vai šajā kadrā ielādēta karte)"""
+        frame_ms, bits = self.frames[self.position]
+        self.position += 1
+        return frame_ms, ReplayKeys(bits), bool(bits & MAP_LOADED)
@@ -0,0 +1,55 @@
+import pygame
+from collections import OrderedDict
+
+# Cik uzrenderētu tekstu paturēt atmiņā
+DEFAULT_MAX_TEXTS = 512
+
+class TextCache:
+    def __init__(self, max_texts=DEFAULT_MAX_TEXTS):
+        """
+        Fontu kopa pēc (nosaukums, izmērs, bold) un uzrenderēto tekstu kešs pēc
+        (fonts, teksts, krāsa, antialias) ar LRU izmešanu
+        """
+        self.max_texts = max_texts
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, name, size, bold=False):
+        """Atgriež kopīgu SysFont (neveido jaunu katrā kadrā)"""
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """Kā font.render, bet tas pats teksts tiek rasterizēts tikai vienreiz"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return surface
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+            "texts": len(self.texts),
+            "fonts": len(self.fonts)
+        }
+
+# Kopīgais teksta kešs visai spēlei
+text_cache = TextCache()
@@ -0,0 +1,68 @@
+import pygame
+
+# Noklusējuma pārejas ilgums sekundēs
+FADE_DURATION = 0.5
+
+class ScreenTransition:
+    def __init__(self, size, duration=FADE_DURATION):
+        """Kadru pa kadram virzīta pāreja (fade/crossfade), ko main cikls atjauno ar dt"""
+        self.duration = duration
+        self.current_duration = duration
+        self.overlay = pygame.Surface(size)
+        self.overlay.fill((0, 0, 0))
+        self.snapshot = None
+        self.mode = None
+        self.progress = 0.0
+
+    @property
+    def active(self):
+        return self.mode is not None
+
+    @property
+    def done(self):
+        return self.progress >= 1
+
+    def _start(self, mode, duration):
+        self.mode = mode
+        self.progress = 0.0
+        self.current_duration = duration or self.duration
+
+    def fade_out(self, duration=None):
+        """Aptumšo ekrānu līdz melnam un paliek melns"""
+        self._start("fade_out", duration)
+
+    def fade_in(self, duration=None):
+        """No melna atpakaļ uz ainu"""
+        self._start("fade_in", duration)
+
+    def capture(self, surface):
+        """Saglabā pašreizējo kadru un rāda to, kamēr tiek ielādēta nākamā karte"""
+        self.snapshot = surface.copy()
+        self.mode = "hold"
+        self.progress = 1.0
+
+    def crossfade(self, duration=None):
+        """Pakāpeniski izgaisina saglabāto kadru virs jaunās ainas"""
+        self._start("crossfade", duration)
+
+    def update(self, dt):
+        if self.mode in (None, "hold"):
+            return
+        self.progress = min(self.progress + dt / self.current_duration, 1.0)
+        if self.done and self.mode in ("fade_in", "crossfade"):
+            self.mode = None
+            self.snapshot = None
+
+    def draw(self, surface):
+        if self.mode == "fade_out":
+            self.overlay.set_alpha(int(255 * self.progress))
+            surface.blit(self.overlay, (0, 0))
+        elif self.mode == "fade_in":
+            self.overlay.set_alpha(int(255 * (1 - self.progress)))
+            surface.blit(self.overlay, (0, 0))
+        elif self.mode == "hold":
+            self.snapshot.set_alpha(255)
+            surface.blit(self.snapshot, (0, 0))
+        elif self.mode == "crossfade":
+            self.snapshot.set_alpha(int(255 * (1 - self.progress)))
+            surface.blit(self.snapshot, (0, 0))
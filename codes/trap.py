@@ -1,19 +1,173 @@
-import pygame, time
-
-class Trap:
-    def __init__(self, x, y, width, height, damage, damage_speed):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.damage = damage
-        self.damage_speed = damage_speed
-        self.last_hit_time = 0
-
-    def check_collision(self, player):
-        current_time = time.time()
-        if self.rect.colliderect(player.rect):
-            interval = max(0.1, 1.0 / self.damage_speed)
-            if current_time - self.last_hit_time > interval:
-                player.take_damage(self.damage)
-                self.last_hit_time = current_time
-
-    def draw(self, screen, camera):
-        pygame.draw.rect(screen, (200, 50, 50), (self.rect.x - camera.x, self.rect.y - camera.y, self.rect.width, self.rect.height), 2)
+import numpy as np
+import pygame
+from array import array
+
+# Režģa šūnas izmērs pikseļos slazdu meklēšanai
+TRAP_CELL_SIZE = 64
+# Šūnas atslēga check_many masīvos: cy * CELL_KEY + cx
+CELL_KEY = 1 << 32
+
+class TrapSet:
+    def __init__(self, cell_size=TRAP_CELL_SIZE):
+        """
+        Visi kartes slazdi kolonnās (array), nevis dict sarakstā. Režģis glabā
+        slazdu indeksus pa šūnām, lai pārbaudītu tikai slazdus zem objekta.
+        Atjaunošanās laiks tiek glabāts katram (objekts, slazds) pārim —
+        last_hit rinda katram objektam.
+        """
+        self.cell_size = cell_size
+        self.x = array("i")
+        self.y = array("i")
+        self.width = array("i")
+        self.height = array("i")
+        self.damage = array("d")
+        self.interval = array("d")   # ms starp sitieniem (1000 / damage_speed)
+        self.cells = {}
+        # Objekta atslēga -> last_hit rinda; last_hit[rinda, slazds] = simulācijas laiks ms, -1 = vēl nav sitis
+        self.entities = {}
+        self.last_hit = np.full((0, 0), -1.0)
+        # Režģis kā sakārtoti (šūnas atslēga, slazds) masīvi check_many vajadzībām
+        self.cell_keys = None
+        self.cell_traps = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, rect, damage, damage_speed):
+        index = len(self.x)
+        self.x.append(rect.x)
+        self.y.append(rect.y)
+        self.width.append(rect.width)
+        self.height.append(rect.height)
+        self.damage.append(damage)
+        self.interval.append(1000 / damage_speed)
+
+        for cell in self._cells_for(rect.left, rect.top, rect.right, rect.bottom):
+            self.cells.setdefault(cell, []).append(index)
+        self.cell_keys = self.cell_traps = None
+
+    def _rows(self, entities):
+        """last_hit rindu indeksi objektiem (jauniem tiek pievienota rinda, jauniem slazdiem — kolonna)"""
+        for entity in entities:
+            if entity not in self.entities:
+                self.entities[entity] = len(self.entities)
+        shape = (len(self.entities), len(self.x))
+        if self.last_hit.shape != shape:
+            last_hit = np.full(shape, -1.0)
+            rows, cols = self.last_hit.shape
+            last_hit[:rows, :cols] = self.last_hit
+            self.last_hit = last_hit
+        return [self.entities[entity] for entity in entities]
+
+    def _cell_arrays(self):
+        if self.cell_keys is None:
+            keys = [cy * CELL_KEY + cx for (cx, cy), indices in self.cells.items() for _ in indices]
+            traps = [index for indices in self.cells.values() for index in indices]
+            keys = np.array(keys, dtype=np.int64)
+            order = np.argsort(keys, kind="stable")
+            self.cell_keys = keys[order]
+            self.cell_traps = np.array(traps, dtype=np.intp)[order]
+        return self.cell_keys, self.cell_traps
+
+    def get_rect(self, index):
+        return pygame.Rect(self.x[index], self.y[index], self.width[index], self.height[index])
+
+    def _cells_for(self, left, top, right, bottom):
+        size = self.cell_size
+        for cy in range(top // size, (bottom - 1) // size + 1):
+            for cx in range(left // size, (right - 1) // size + 1):
+                yield (cx, cy)
+
+    def query(self, rect):
+        """Slazdu indeksi, kas pārklājas ar rect"""
+        found = set()
+        for cell in self._cells_for(rect.left, rect.top, rect.right, rect.bottom):
+            for index in self.cells.get(cell, ()):
+                if (self.x[index] < rect.right and rect.left < self.x[index] + self.width[index]
+                        and self.y[index] < rect.bottom and rect.top < self.y[index] + self.height[index]):
+                    found.add(index)
+        return sorted(found)
+
+    def check(self, rect, now, entity=None):
+        """
+        Pārbauda pārklāšanos un atjaunošanās laiku visiem slazdiem zem rect.
+        entity — objekta atslēga, kura atjaunošanās laiki tiek izmantoti.
+        Atgriež (vai pieskaras, [bojājumi katram sitienam]).
+        """
+        indices = self.query(rect)
+        if not indices:
+            return False, []
+        row = self._rows((entity,))[0]
+        last_hit = self.last_hit[row]
+        hits = []
+        for index in indices:
+            last = last_hit[index]
+            # -1 vai cita spēlētāja laiks (pēc restarta) — sit uzreiz
+            if last < 0 or last > now or now - last >= self.interval[index]:
+                hits.append(self.damage[index])
+                last_hit[index] = now
+        return True, hits
+
+    def check_many(self, rects, now, entities=None):
+        """
+        check() vairākiem objektiem vienā NumPy piegājienā: kandidātu pāri
+        (objekts, slazds) no režģa šūnām, tad pārklāšanās un atjaunošanās visiem pāriem.
+        rects — Rect saraksts vai (N, 4) masīvs; entities — objektu atslēgas
+        (noklusējumā 0..N-1). Atgriež [(vai pieskaras, [bojājumi])] katram objektam.
+        """
+        boxes = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+        count = len(boxes)
+        if not count or not len(self.x):
+            return [(False, []) for _ in range(count)]
+        rows = np.array(self._rows(range(count) if entities is None else entities), dtype=np.intp)
+        cell_keys, cell_traps = self._cell_arrays()
+
+        # Šūnas zem katra objekta (tāpat kā _cells_for)
+        left, top = boxes[:, 0], boxes[:, 1]
+        right, bottom = left + boxes[:, 2], top + boxes[:, 3]
+        size = self.cell_size
+        cx0 = np.floor_divide(left, size).astype(np.int64)
+        cy0 = np.floor_divide(top, size).astype(np.int64)
+        span_x = np.floor_divide(right - 1, size).astype(np.int64) - cx0 + 1
+        span_y = np.floor_divide(bottom - 1, size).astype(np.int64) - cy0 + 1
+        max_x, max_y = max(span_x.max(), 1), max(span_y.max(), 1)
+        off_y, off_x = np.divmod(np.arange(max_x * max_y), max_x)
+        valid = (off_x < span_x[:, None]) & (off_y < span_y[:, None])
+        keys = ((cy0[:, None] + off_y) * CELL_KEY + cx0[:, None] + off_x)[valid]
+        owner = np.nonzero(valid)[0]
+
+        # Šūnu slazdi -> unikāli (objekts, slazds) pāri objektu, tad slazdu secībā
+        lo = np.searchsorted(cell_keys, keys, "left")
+        found = np.searchsorted(cell_keys, keys, "right") - lo
+        ends = np.cumsum(found)
+        slots = np.repeat(lo - ends + found, found) + np.arange(ends[-1] if len(ends) else 0)
+        trap_count = len(self.x)
+        pairs = np.unique(np.repeat(owner, found) * trap_count + cell_traps[slots])
+        entity, trap = np.divmod(pairs, trap_count)
+
+        x = np.frombuffer(self.x, dtype=np.int32)[trap]
+        y = np.frombuffer(self.y, dtype=np.int32)[trap]
+        trap_right = x + np.frombuffer(self.width, dtype=np.int32)[trap]
+        trap_bottom = y + np.frombuffer(self.height, dtype=np.int32)[trap]
+        overlap = ((x < right[entity]) & (left[entity] < trap_right)
+                   & (y < bottom[entity]) & (top[entity] < trap_bottom))
+        entity, trap = entity[overlap], trap[overlap]
+        touching = np.zeros(count, dtype=bool)
+        touching[entity] = True
+
+        last_hit = self.last_hit[rows[entity], trap]
+        ready = ((last_hit < 0) | (last_hit > now)
+                 | (now - last_hit >= np.frombuffer(self.interval)[trap]))
+        entity, trap = entity[ready], trap[ready]
+        self.last_hit[rows[entity], trap] = now
+
+        # Bojājumi sagrupēti pa objektiem
+        damage = np.frombuffer(self.damage)[trap].tolist()
+        ends = np.cumsum(np.bincount(entity, minlength=count)).tolist()
+        touching = touching.tolist()
+        results = []
+        start = 0
+        for i in range(count):
+            results.append((touching[i], damage[start:ends[i]]))
+            start = ends[i]
+        return results
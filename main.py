@@ -1,9 +1,27 @@
+import time
+# Starta laika atskaite (--startup-time) — pirms smagajiem importiem
+STARTUP_BEGIN = time.perf_counter()
+
+import json
+import os
 import pygame
 import sys
-from codes.map import GameMap
-from codes.player import Player
+from codes.map import map_cache
+from codes.player import Player, FIXED_DT
 from codes.door_animator import DoorAnimator
-from codes.gui import Button, fade
+from codes.collision import CollisionGrid
+from codes.gui import Button
+from codes.transition import ScreenTransition
+from codes.profiler import FrameProfiler
+from codes.render_targets import RenderTargets
+from codes.text_cache import text_cache
+from codes.replay import InputRecorder, InputLog, player_checksum, MAX_FRAME_MS
+
+# --record <fails> — ieraksta ievadi; --replay <fails> — atkārto to bez loga un FPS ierobežojuma
+RECORD_PATH = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv[:-1] else None
+REPLAY_PATH = sys.argv[sys.argv.index("--replay") + 1] if "--replay" in sys.argv[:-1] else None
+if REPLAY_PATH:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
 pygame.init()
 
@@ -14,45 +32,54 @@ SCREEN_WIDTH, SCREEN_HEIGHT = ORIGINAL_WIDTH * SCALE, ORIGINAL_HEIGHT * SCALE
 
 fullscreen = True
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+render_targets = RenderTargets((ORIGINAL_WIDTH, ORIGINAL_HEIGHT))
+render_targets.resize(screen)
 clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 32)
+# Renderēšanas FPS ierobežojums (0 = bez ierobežojuma); simulācija vienmēr iet ar FIXED_DT
+MAX_FPS = 0 if "--uncapped" in sys.argv else 60
+# --profile <fails.json|fails.csv> — saglabā profilera datus, izejot no spēles
+PROFILE_PATH = sys.argv[sys.argv.index("--profile") + 1] if "--profile" in sys.argv[:-1] else None
+# Pēc ilgas pauzes (logu vilkšana u.c.) neķer pakaļ vairāk par šo laiku
+MAX_FRAME_TIME = 0.25
+# --startup-time — izmēra laiku līdz pirmajam izvēlnes kadram un līdz gatavai pasaulei, tad iziet
+MEASURE_STARTUP = "--startup-time" in sys.argv
+font = text_cache.get_font(None, 32)
+
+# "fade" — caur melnu ekrānu, "crossfade" — vecā karte izgaist virs jaunās
+TRANSITION_STYLE = "fade"
+screen_transition = ScreenTransition((ORIGINAL_WIDTH, ORIGINAL_HEIGHT))
+# Fāžu laiki pēdējiem kadriem, F3 rāda grafiku
+profiler = FrameProfiler()
 
 # --- Camera ---
 class Camera:
     def __init__(self):
         self.offset = pygame.Vector2(0, 0)
 
-    def update(self, target):
-        self.offset.x = target.rect.centerx - ORIGINAL_WIDTH // 2
-        self.offset.y = target.rect.centery - ORIGINAL_HEIGHT // 2
+    def update(self, target, alpha=1.0):
+        pos = target.get_render_pos(alpha)
+        self.offset.x = round(pos.x + target.rect.width / 2) - ORIGINAL_WIDTH // 2
+        self.offset.y = round(pos.y + target.rect.height / 2) - ORIGINAL_HEIGHT // 2
 
 # --- Helper ---
 def get_solid_tiles(map_data):
-    tiles = []
-    for layer in map_data.tmx_data.visible_layers:
-        if hasattr(layer, "tiles"):
-            for x, y, image in layer.tiles():
-                if image:
-                    rect = pygame.Rect(
-                        x * map_data.tilewidth,
-                        y * map_data.tileheight,
-                        map_data.tilewidth,
-                        map_data.tileheight
-                    )
-                    tiles.append(rect)
-    return tiles
+    return CollisionGrid(map_data)
 
 # --- Game Setup ---
+START_MAP = "starter_area.tmx"
+
 def start_game():
     global current_map, player, camera, tiles, door_animator, transition_active, transition_data
-    current_map = GameMap("starter_area.tmx")
+    # Karte parasti jau ir ielādēta fonā, kamēr bija redzama izvēlne
+    current_map = map_cache.get(START_MAP)
+    map_cache.prefetch_doors(current_map)
     player = Player(*current_map.spawn_point)
     camera = Camera()
     tiles = get_solid_tiles(current_map)
     door_animator = DoorAnimator("textures/map/door-opening.png", 32, 32, fps=12)
     transition_active = False
     transition_data = {}
-    fade(screen, fade_in=True)
+    screen_transition.fade_in()
 
 # --- Buttons ---
 menu_buttons = [
@@ -66,17 +93,63 @@ pause_buttons = [
     Button(SCREEN_HEIGHT // 2 + 20, "menu", "textures/gui/quit-btn.png", SCREEN_WIDTH)
 ]
 
+# --- Input recording / replay ---
+# Ieraksta pirmo spēles sesiju (līdz izejai uz izvēlni vai spēles beigām)
+recorder = InputRecorder(START_MAP) if RECORD_PATH else None
+replay = InputLog.load(REPLAY_PATH) if REPLAY_PATH else None
+exit_code = 0
+
+def stop_recording():
+    global recorder
+    if recorder and recorder.count:
+        recorder.save(RECORD_PATH, player_checksum(player, current_map))
+        print(f"[record] {recorder.count} frames -> {RECORD_PATH}")
+    recorder = None
+
+def finish_replay():
+    """Salīdzina spēlētāja stāvokli pēc pēdējā kadra ar ierakstīto kontrolsummu"""
+    checksum = player_checksum(player, current_map)
+    print(json.dumps({
+        "frames": len(replay.frames),
+        "seconds": round(time.perf_counter() - replay_started, 3),
+        "map": current_map.filename,
+        "player": [player.rect.x, player.rect.y],
+        "hp": player.hp,
+        "checksum": checksum,
+        "expected": replay.checksum,
+        "ok": checksum == replay.checksum
+    }))
+    return checksum == replay.checksum
+
 # --- Main Loop ---
 game_state = "menu"
-start_game()
+if replay:
+    START_MAP = replay.start_map
+    start_game()
+    game_state = "playing"
+    replay_started = time.perf_counter()
+# Sākuma karte lādējas fonā, izvēlne tiek rādīta uzreiz
+map_cache.prefetch(START_MAP)
 door_cooldown = 1000
-last_door_use = 0
+# Spēles laiks ms (tikai "playing" kadri) — durvju atdzišanai, lai atkārtojums sakristu
+game_time = 0
+last_door_use = -door_cooldown
 player_slide_speed = 60
+accumulator = 0.0
 running = True
 
 while running:
-    dt = clock.tick(60) / 1000
-    current_time = pygame.time.get_ticks()
+    if replay:
+        if replay.finished:
+            exit_code = 0 if finish_replay() else 1
+            break
+        frame_ms, replay_keys, replay_map_loaded = replay.next_frame()
+    else:
+        frame_ms = clock.tick(MAX_FPS)
+        if recorder:
+            frame_ms = min(frame_ms, MAX_FRAME_MS)
+    dt = frame_ms / 1000
+    profiler.begin_frame()
     click = False
     mouse_pos = pygame.mouse.get_pos()
 
@@ -87,19 +160,23 @@ while running:
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             click = True
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+            if event.key == pygame.K_ESCAPE and game_state in ("playing", "paused"):
                 game_state = "paused" if game_state == "playing" else "playing"
+            elif event.key == pygame.K_F3:
+                profiler.toggle_overlay()
             elif event.key == pygame.K_F11:
                 fullscreen = not fullscreen
                 screen = pygame.display.set_mode(
                     (SCREEN_WIDTH, SCREEN_HEIGHT),
                     pygame.FULLSCREEN if fullscreen else 0
                 )
+                render_targets.resize(screen)
+    profiler.lap("events")
 
     # --- MENU STATE ---
     if game_state == "menu":
         screen.fill((40, 40, 60))
-        title = font.render("My RPG Game", True, (255, 255, 255))
+        title = text_cache.render(font, "My RPG Game", (255, 255, 255))
         screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
 
         for btn in menu_buttons:
@@ -107,79 +184,144 @@ while running:
             btn.draw(screen)
             if result:
                 if result == "playing":
-                    start_game()
+                    if map_cache.is_loading(START_MAP):
+                        result = "loading"
+                    else:
+                        start_game()
                 elif result == "quit":
                     running = False
                 game_state = result or game_state
+        profiler.lap("menu")
+
+    # --- LOADING STATE (Start nospiests pirms karte ielādēta) ---
+    elif game_state == "loading":
+        screen.fill((40, 40, 60))
+        loading_text = text_cache.render(font, "Loading...", (255, 255, 255))
+        screen.blit(loading_text, (SCREEN_WIDTH // 2 - loading_text.get_width() // 2, SCREEN_HEIGHT // 2))
+        if not map_cache.is_loading(START_MAP):
+            start_game()
+            game_state = "playing"
+        profiler.lap("menu")
 
     # --- PLAYING STATE ---
     elif game_state == "playing":
-        keys = pygame.key.get_pressed()
-        if not transition_active:
-            player.handle_input(keys)
-            player.apply_gravity()
-            player.update(tiles, current_map.traps)
-        camera.update(player)
-
-        temp_surface = pygame.Surface((ORIGINAL_WIDTH, ORIGINAL_HEIGHT))
+        game_time += frame_ms
+        keys = replay_keys if replay else pygame.key.get_pressed()
+        map_loaded = False
+        if transition_active:
+            accumulator = 0.0
+            player.prev_pos.update(player.rect.topleft)
+            current_map.mobs.reset_interpolation()
+        else:
+            # Fiksēta soļa simulācija: 0..N soļi kadrā neatkarīgi no FPS
+            accumulator = min(accumulator + dt, MAX_FRAME_TIME)
+            while accumulator >= FIXED_DT:
+                player.prev_pos.update(player.rect.topleft)
+                player.handle_input(keys)
+                player.apply_gravity()
+                player.update(tiles, current_map.traps)
+                current_map.mobs.update(tiles)
+                accumulator -= FIXED_DT
+        alpha = accumulator / FIXED_DT
+        camera.update(player, alpha)
+        profiler.lap("simulation")
+
+        temp_surface = render_targets.world
         temp_surface.fill((0, 0, 0))
-        current_map.draw(temp_surface, camera)
-        player.draw(temp_surface, camera)
+        current_map.draw(temp_surface, camera, alpha)
+        player.draw(temp_surface, camera, alpha)
+        profiler.set_counters(current_map.draw_stats)
+        profiler.lap("map_draw")
 
         # --- Doors ---
         for door in current_map.doors:
             if player.rect.colliderect(door["rect"]) and door["target"] and door["pair"]:
-                text = font.render("Press O to enter", True, (255, 255, 255))
+                text = text_cache.render(font, "Press O to enter", (255, 255, 255))
                 temp_surface.blit(text, (door["rect"].x - camera.offset.x, door["rect"].y - 20 - camera.offset.y))
-                if keys[pygame.K_o] and not transition_active and current_time - last_door_use >= door_cooldown:
-                    last_door_use = current_time
+                if keys[pygame.K_o] and not transition_active and game_time - last_door_use >= door_cooldown:
+                    last_door_use = game_time
                     transition_active = True
-                    transition_data = {"target": door["target"], "pair": door["pair"], "door_rect": door["rect"]}
+                    transition_data = {
+                        "phase": "door",
+                        "target": door["target"],
+                        "pair": door["pair"],
+                        "door_rect": door["rect"]
+                    }
                     door_animator.play(door["rect"].x, door["rect"].y)
 
         # --- NPCs ---
         for npc in current_map.npcs:
             if player.rect.colliderect(npc.rect) and not npc.in_dialogue:
-                t_text = font.render("Press T to talk", True, (255, 255, 255))
+                t_text = text_cache.render(font, "Press T to talk", (255, 255, 255))
                 temp_surface.blit(t_text, (npc.rect.x - camera.offset.x, npc.rect.y - 20 - camera.offset.y))
             npc.draw_dialogue(temp_surface)
+        profiler.lap("doors_npcs")
 
         # --- Transition ---
         if transition_active:
-            door_animator.update(dt)
-            door_rect = transition_data["door_rect"]
-            slide_vector = pygame.Vector2(door_rect.center) - pygame.Vector2(player.rect.center)
-            if slide_vector.length() > 1:
-                slide_vector.scale_to_length(player_slide_speed * dt)
-                player.rect.center += slide_vector
-            door_animator.draw(temp_surface, camera)
-
-            if door_animator.finished:
-                fade(screen, fade_in=False)
-                new_map = GameMap(transition_data["target"])
-                spawn = None
-                for d in new_map.doors:
-                    if d["pair"] == transition_data["pair"]:
-                        spawn = d["rect"].topleft
-                        break
-                player.rect.topleft = spawn if spawn else new_map.spawn_point
-                current_map = new_map
-                tiles = get_solid_tiles(current_map)
-                fade(screen, fade_in=True)
+            phase = transition_data["phase"]
+            if phase == "door":
+                door_animator.update(dt)
+                door_rect = transition_data["door_rect"]
+                slide_vector = pygame.Vector2(door_rect.center) - pygame.Vector2(player.rect.center)
+                if slide_vector.length() > 1:
+                    slide_vector.scale_to_length(player_slide_speed * dt)
+                    player.rect.center += slide_vector
+                door_animator.draw(temp_surface, camera)
+
+                if door_animator.finished:
+                    # Nākamā karte lādējas fonā, kamēr ekrāns aptumšojas
+                    map_cache.prefetch(transition_data["target"])
+                    if TRANSITION_STYLE == "crossfade":
+                        screen_transition.capture(temp_surface)
+                    else:
+                        screen_transition.fade_out()
+                    transition_data["phase"] = "out"
+
+            elif phase == "out":
+                # Atkārtojot karte tiek "ielādēta" tieši tajā kadrā, kurā ierakstā
+                if replay:
+                    ready = replay_map_loaded
+                else:
+                    ready = screen_transition.done and map_cache.is_ready(transition_data["target"])
+                if ready:
+                    new_map = map_cache.get(transition_data["target"])
+                    map_cache.prefetch_doors(new_map)
+                    spawn = None
+                    for d in new_map.doors:
+                        if d["pair"] == transition_data["pair"]:
+                            spawn = d["rect"].topleft
+                            break
+                    player.rect.topleft = spawn if spawn else new_map.spawn_point
+                    current_map = new_map
+                    tiles = get_solid_tiles(current_map)
+                    if TRANSITION_STYLE == "crossfade":
+                        screen_transition.crossfade()
+                    else:
+                        screen_transition.fade_in()
+                    transition_data["phase"] = "in"
+                    map_loaded = True
+
+            elif phase == "in" and not screen_transition.active:
                 transition_active = False
                 transition_data = {}
 
-        zoomed_surface = pygame.transform.scale(temp_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(zoomed_surface, (0, 0))
+        screen_transition.update(dt)
+        screen_transition.draw(temp_surface)
+        profiler.lap("transition")
+
+        if not replay:
+            render_targets.present(screen)
+        profiler.lap("upscale")
+
+        if recorder:
+            recorder.record(frame_ms, keys, map_loaded)
 
     # --- PAUSED STATE ---
     elif game_state == "paused":
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(render_targets.pause_overlay, (0, 0))
 
-        pause_text = font.render("Game Paused", True, (255, 255, 255))
+        pause_text = text_cache.render(font, "Game Paused", (255, 255, 255))
         screen.blit(pause_text, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, 50))
 
         for btn in pause_buttons:
@@ -187,11 +329,32 @@ while running:
             btn.draw(screen)
             if result:
                 if result == "menu":
+                    stop_recording()
                     game_state = "menu"
                 elif result == "playing":
                     game_state = "playing"
+        profiler.lap("paused")
+
+    profiler.draw_overlay(screen)
+    profiler.lap("overlay")
+    if not replay:
+        pygame.display.flip()
+    profiler.lap("flip")
+    profiler.end_frame()
+
+    if MEASURE_STARTUP:
+        first_frame_ms = (time.perf_counter() - STARTUP_BEGIN) * 1000
+        start_game()
+        world_ready_ms = (time.perf_counter() - STARTUP_BEGIN) * 1000
+        print(json.dumps({
+            "first_frame_ms": round(first_frame_ms, 1),
+            "world_ready_ms": round(world_ready_ms, 1)
+        }))
+        running = False
 
-    pygame.display.flip()
+stop_recording()
+if PROFILE_PATH:
+    profiler.export(PROFILE_PATH)
 
 pygame.quit()
-sys.exit()
+sys.exit(exit_code)